@@ -6,71 +6,69 @@
 사용법: python clear_db_simple.py
 """
 
-from sqlalchemy.orm import sessionmaker
-from models.database import engine
-from models.patient import Patient
-from models.patient_measurement import PatientMeasurement
-from models.prescription_order import PrescriptionOrder
-from models.prescription import Prescription
+import logging
+import sys
+from sqlalchemy import text
+from models.database import engine, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 삭제 순서: 자식 테이블 → 부모 테이블
+CLEAR_ORDER = (
+    ("prescriptions", "자식 테이블"),
+    ("prescription_orders", "중간 테이블"),
+    ("patient_measurements", "환자 자식 테이블"),
+    ("patients", "부모 테이블"),
+)
 
 
 def clear_all_data():
     """데이터베이스의 모든 데이터를 삭제합니다."""
     
-    print("🧹 CarePlus 데이터베이스 정리 시작...")
+    logger.info("🧹 CarePlus 데이터베이스 정리 시작...")
     
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
     
     try:
-        # 삭제 전 데이터 카운트
-        prescription_count = db.query(Prescription).count()
-        order_count = db.query(PrescriptionOrder).count()
-        measurement_count = db.query(PatientMeasurement).count()
-        patient_count = db.query(Patient).count()
+        # 삭제 전 데이터 카운트 (네 테이블을 한 번의 쿼리로 조회)
+        prescription_count, order_count, measurement_count, patient_count = db.execute(text(
+            "SELECT (SELECT COUNT(*) FROM prescriptions),"
+            " (SELECT COUNT(*) FROM prescription_orders),"
+            " (SELECT COUNT(*) FROM patient_measurements),"
+            " (SELECT COUNT(*) FROM patients)"
+        )).one()
         total_count = prescription_count + order_count + measurement_count + patient_count
         
         if total_count == 0:
-            print("📭 데이터베이스가 이미 비어있습니다.")
+            logger.info("📭 데이터베이스가 이미 비어있습니다.")
             return
         
-        print(f"📊 현재 데이터:")
-        print(f"   - 처방: {prescription_count}개")
-        print(f"   - 주문: {order_count}개")
-        print(f"   - 검사수치 이력: {measurement_count}개")
-        print(f"   - 환자: {patient_count}개")
-        print(f"   - 총합: {total_count}개")
-        print()
+        logger.info(
+            "📊 현재 데이터:\n"
+            "   - 처방: %s개\n"
+            "   - 주문: %s개\n"
+            "   - 검사수치 이력: %s개\n"
+            "   - 환자: %s개\n"
+            "   - 총합: %s개\n",
+            prescription_count, order_count, measurement_count, patient_count, total_count
+        )
         
         # 외래키 제약조건을 고려하여 역순으로 삭제
-        print("🗑️  데이터 삭제 중...")
-        
-        # 1. prescriptions 테이블 (자식 테이블)
-        db.query(Prescription).delete()
-        print("   ✅ prescriptions 테이블 삭제 완료")
-        
-        # 2. prescription_orders 테이블 (중간 테이블)
-        db.query(PrescriptionOrder).delete()
-        print("   ✅ prescription_orders 테이블 삭제 완료")
+        # ORM 행 단위 삭제 대신 테이블당 DELETE 한 문장을 하나의 트랜잭션에서 실행
+        logger.info("🗑️  데이터 삭제 중...")
         
-        # 3. patient_measurements 테이블 (환자 자식 테이블)
-        db.query(PatientMeasurement).delete()
-        print("   ✅ patient_measurements 테이블 삭제 완료")
-        
-        # 4. patients 테이블 (부모 테이블)
-        db.query(Patient).delete()
-        print("   ✅ patients 테이블 삭제 완료")
+        for table_name, label in CLEAR_ORDER:
+            db.execute(text(f"DELETE FROM {table_name}"))
+            logger.info("   ✅ %s 테이블 삭제 완료 (%s)", table_name, label)
         
         # 변경사항 저장
         db.commit()
-        print()
-        print("🎉 모든 데이터 삭제가 완료되었습니다!")
-        print(f"총 {total_count}개의 레코드가 삭제되었습니다.")
+        logger.info("\n🎉 모든 데이터 삭제가 완료되었습니다!\n총 %s개의 레코드가 삭제되었습니다.", total_count)
         
     except Exception as e:
-        print(f"❌ 오류가 발생했습니다: {e}")
+        logger.error("❌ 오류가 발생했습니다: %s", e)
         db.rollback()
-        print("⚠️  변경사항이 롤백되었습니다.")
+        logger.warning("⚠️  변경사항이 롤백되었습니다.")
         raise e
         
     finally:
@@ -78,4 +76,10 @@ def clear_all_data():
 
 
 if __name__ == "__main__":
-    clear_all_data() 
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
+    try:
+        clear_all_data()
+    finally:
+        # 스크립트 종료 전 커넥션 풀 정리
+        engine.dispose() 
\ No newline at end of file
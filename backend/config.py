@@ -1,23 +1,32 @@
-from typing import List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
 
 
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """애플리케이션 설정"""
+    """애플리케이션 설정 (불변)"""
     
     # 기본 설정
     app_title: str = "신기능 처방 감사 API"
     app_version: str = "1.0.0"
     app_description: str = "의료진을 위한 처방 감사 및 약물 정보 API 서버"
     
-    # CORS 설정
-    allowed_origins: List[str] = ["*"]  # 실제 배포시에는 특정 도메인으로 제한 권장
+    # CORS 설정 (공유 가변 상태를 피하기 위해 tuple 사용)
+    allowed_origins: Tuple[str, ...] = ("*",)  # 실제 배포시에는 특정 도메인으로 제한 권장
     allow_credentials: bool = True
-    allowed_methods: List[str] = ["*"]
-    allowed_headers: List[str] = ["*"]
+    allowed_methods: Tuple[str, ...] = ("*",)
+    allowed_headers: Tuple[str, ...] = ("*",)
     
     # 개발 모드
     debug: bool = True
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """설정 싱글톤 인스턴스를 반환합니다."""
+    return Settings()
+
+
 # 설정 인스턴스
-settings = Settings() 
\ No newline at end of file
+settings = get_settings()
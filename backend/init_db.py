@@ -3,6 +3,7 @@
 이 스크립트를 실행하면 SQLite 데이터베이스와 모든 테이블이 생성됩니다.
 """
 
+from sqlalchemy import text
 from models.database import engine, Base
 # patients 테이블을 맨 위로 올리기 위해 가장 먼저 import
 from models.patient import Patient
@@ -10,11 +11,40 @@ from models.patient_measurement import PatientMeasurement
 from models.prescription_order import PrescriptionOrder
 from models.prescription import Prescription
 
+# 기존 데이터베이스에 남아 있는 기본키 중복 인덱스 (기본키가 이미 rowid 인덱스로 처리됨)
+REDUNDANT_INDEXES = (
+    "ix_patients_id",
+    "ix_patient_measurements_id",
+    "ix_prescription_orders_id",
+    "ix_prescriptions_id",
+)
+
+
+def drop_redundant_indexes():
+    """기존 데이터베이스에 남아 있는 불필요한 인덱스를 삭제합니다."""
+    with engine.begin() as connection:
+        for index_name in REDUNDANT_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+
+def create_missing_indexes():
+    """기존 데이터베이스에 없는 인덱스를 추가로 생성합니다.
+
+    create_all은 이미 존재하는 테이블의 인덱스를 만들지 않으므로
+    모델에 새로 선언된 인덱스(외래키 인덱스 등)를 여기서 보완합니다.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def create_tables():
     """모든 테이블을 생성합니다."""
     print("데이터베이스 테이블을 생성하고 있습니다...")
     print("테이블 생성 순서: patients → patient_measurements → prescription_orders → prescriptions")
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
+    drop_redundant_indexes()
     print("테이블 생성이 완료되었습니다!")
     print("생성된 테이블:")
     print("- patients (기본정보)")
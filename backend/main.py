@@ -1,34 +1,83 @@
-from fastapi import FastAPI
+import atexit
+import logging
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 from routers import drug_router, patient_router, prescription_router, audit_router
 from config import settings
 
 
+def configure_logging(level: int = logging.INFO):
+    """
+    로그를 큐에 넣고 별도 스레드가 출력하도록 설정합니다.
+    요청 처리 스레드는 stdout 쓰기를 기다리지 않고 큐에 넣기만 합니다.
+    이미 루트 로거에 핸들러가 있으면 (basicConfig와 마찬가지로) 아무것도 하지 않습니다.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+    
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)  # 종료 시 남은 로그 출력
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 약물/감사 기준 데이터를 미리 로드하여 첫 요청 지연을 없앱니다."""
+    from services.drug_service import get_drug_service
+    from services.prescription_audit_service import get_audit_service
+    
+    get_drug_service()
+    get_audit_service()
+    yield
+
+
 def create_app() -> FastAPI:
     """FastAPI 애플리케이션을 생성하고 설정합니다."""
     
+    # 애플리케이션 로그는 INFO 이상만 출력 (DEBUG 로그는 포맷팅 비용 없이 무시됨)
+    configure_logging(logging.INFO)
+    
     # FastAPI 앱 생성
     app = FastAPI(
         title=settings.app_title,
         version=settings.app_version,
         description=settings.app_description,
         debug=settings.debug,
+        default_response_class=ORJSONResponse,  # orjson으로 응답 직렬화
+        lifespan=lifespan,
     )
     
     # CORS 미들웨어 추가
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.allowed_origins,
+        allow_origins=list(settings.allowed_origins),
         allow_credentials=settings.allow_credentials,
-        allow_methods=settings.allowed_methods,
-        allow_headers=settings.allowed_headers,
+        allow_methods=list(settings.allowed_methods),
+        allow_headers=list(settings.allowed_headers),
     )
     
     # 라우터 등록
-    app.include_router(drug_router.router)
-    app.include_router(patient_router.router)
-    app.include_router(prescription_router.router)
-    app.include_router(audit_router.router)
+    for module in (drug_router, patient_router, prescription_router, audit_router):
+        app.include_router(module.router)
+    
+    # DB 오류는 라우터마다 try/except로 감싸지 않고 한 곳에서 400 응답으로 변환
+    @app.exception_handler(SQLAlchemyError)
+    async def handle_database_error(request: Request, exc: SQLAlchemyError):
+        logging.getLogger(__name__).warning("DB 오류 (%s %s): %s", request.method, request.url.path, exc)
+        return ORJSONResponse(status_code=400, content={"detail": f"데이터베이스 오류: {exc}"})
     
     return app
 
@@ -59,12 +108,13 @@ if __name__ == "__main__":
     
     print(f"🚀 {settings.app_title} v{settings.app_version} 시작 중...")
     print("📖 API 문서: http://127.0.0.1:8000/docs")
-    print("🔄 자동 새로고침 모드로 실행")
+    if settings.debug:
+        print("🔄 자동 새로고침 모드로 실행")
     
     uvicorn.run(
         "main:app",
         host="127.0.0.1",
         port=8000,
-        reload=True,
+        reload=settings.debug,  # 운영 환경에서는 파일 감시 프로세스를 띄우지 않음
         log_level="info"
     ) 
\ No newline at end of file
@@ -3,140 +3,163 @@
 기존 patients 테이블의 검사수치를 새로운 patient_measurements 테이블로 마이그레이션
 """
 
-import sqlite3
-from datetime import datetime
-from sqlalchemy import text
-from sqlalchemy.orm import sessionmaker
+import logging
+import sys
+from sqlalchemy.schema import CreateIndex
 from models.database import engine, Base
+# create_all 대상 테이블 등록을 위해 모델 import
 from models.patient import Patient
 from models.patient_measurement import PatientMeasurement
 
+logger = logging.getLogger(__name__)
+
 
 def migrate_patient_data():
     """기존 환자 데이터를 새로운 구조로 마이그레이션"""
     
-    print("🔄 환자 데이터 마이그레이션을 시작합니다...")
+    logger.info("🔄 환자 데이터 마이그레이션을 시작합니다...")
     
-    # 직접 SQLite 연결을 사용하여 기존 데이터 조회
-    conn = sqlite3.connect('./data/careplus.db')
+    # 별도 sqlite3 연결 대신 엔진 풀의 DBAPI 연결을 공유하여 파일 잠금/페이지 캐시 경합 방지
+    conn = engine.raw_connection()
     cursor = conn.cursor()
     
     try:
-        # 기존 patients 테이블에서 데이터 조회
-        cursor.execute("""
-            SELECT id, name, sex, birth_date, weight_kg, height_cm, scr_mg_dl, 
-                   egfr, crcl, crcl_normalized, bsa, is_hd, created_at
-            FROM patients
-        """)
-        
-        existing_patients = cursor.fetchall()
-        print(f"📊 기존 환자 데이터: {len(existing_patients)}명")
+        # 기존 patients 테이블의 환자 수 확인 (전체 행을 메모리에 올리지 않음)
+        cursor.execute("SELECT COUNT(*) FROM patients")
+        existing_patient_count = cursor.fetchone()[0]
+        logger.info("📊 기존 환자 데이터: %s명", existing_patient_count)
         
-        if not existing_patients:
-            print("📭 마이그레이션할 데이터가 없습니다.")
+        if not existing_patient_count:
+            logger.info("📭 마이그레이션할 데이터가 없습니다.")
             return
         
         # 새로운 테이블 구조 생성
-        print("🏗️  새로운 테이블 구조를 생성합니다...")
+        logger.info("🏗️  새로운 테이블 구조를 생성합니다...")
         Base.metadata.create_all(bind=engine)
         
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        db = SessionLocal()
-        
         try:
-            # 기존 patients 테이블 백업
-            print("💾 기존 patients 테이블을 백업합니다...")
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS patients_backup AS 
-                SELECT * FROM patients
-            """)
-            
-            # 새로운 patients 테이블 생성 (검사수치 제외)
-            cursor.execute("""
-                CREATE TABLE patients_new (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT,
-                    sex VARCHAR(1) NOT NULL,
-                    birth_date VARCHAR(10) NOT NULL,
-                    created_at DATETIME NOT NULL
-                )
-            """)
-            
-            # 기본 환자 정보만 새 테이블로 복사
-            cursor.execute("""
-                INSERT INTO patients_new (id, name, sex, birth_date, created_at)
-                SELECT id, name, sex, birth_date, created_at FROM patients
-            """)
-            
-            # 기존 patients 테이블 삭제하고 새 테이블로 교체
-            cursor.execute("DROP TABLE patients")
-            cursor.execute("ALTER TABLE patients_new RENAME TO patients")
-            
-            # 인덱스 재생성
-            cursor.execute("CREATE INDEX ix_patients_id ON patients (id)")
-            
-            conn.commit()
-            print("✅ 환자 기본정보 테이블 재구성 완료")
-            
-            # 검사수치 데이터를 patient_measurements로 이동
-            print("📋 검사수치를 patient_measurements 테이블로 이동합니다...")
-            
-            for patient_data in existing_patients:
-                (patient_id, name, sex, birth_date, weight_kg, height_cm, 
-                 scr_mg_dl, egfr, crcl, crcl_normalized, bsa, is_hd, created_at) = patient_data
+            # 엔진 연결은 foreign_keys=ON 이므로, patients 테이블 DROP 시
+            # ON DELETE CASCADE로 검사수치가 삭제되지 않도록 재구성 동안 비활성화
+            # (PRAGMA foreign_keys는 트랜잭션 밖에서만 적용됨)
+            cursor.execute("PRAGMA foreign_keys=OFF")
+            
+            # 테이블 재구성과 검사수치 이동 전체를 하나의 쓰기 트랜잭션으로 묶음
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # 기존 patients 테이블 백업
+                logger.info("💾 기존 patients 테이블을 백업합니다...")
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS patients_backup AS 
+                    SELECT * FROM patients
+                """)
                 
-                # 검사수치가 모두 0이 아닌 경우만 저장
-                if weight_kg or height_cm or scr_mg_dl or egfr or crcl or bsa:
-                    measurement = PatientMeasurement(
-                        patient_id=patient_id,
-                        weight_kg=weight_kg or 0,
-                        height_cm=height_cm or 0,
-                        scr_mg_dl=scr_mg_dl or 0,
-                        egfr=egfr or 0,
-                        crcl=crcl or 0,
-                        crcl_normalized=crcl_normalized or 0,
-                        bsa=bsa or 0,
-                        is_hd=bool(is_hd),
-                        measured_at=datetime.fromisoformat(created_at.replace('Z', '+00:00')) if created_at else datetime.utcnow(),
-                        created_at=datetime.utcnow()
+                # 새로운 patients 테이블 생성 (검사수치 제외)
+                cursor.execute("""
+                    CREATE TABLE patients_new (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT,
+                        sex VARCHAR(1) NOT NULL,
+                        birth_date VARCHAR(10) NOT NULL,
+                        created_at DATETIME NOT NULL
                     )
-                    
-                    db.add(measurement)
+                """)
+                
+                # 기본 환자 정보만 새 테이블로 복사
+                cursor.execute("""
+                    INSERT INTO patients_new (id, name, sex, birth_date, created_at)
+                    SELECT id, name, sex, birth_date, created_at FROM patients
+                """)
+                
+                # 검사수치 데이터를 patient_measurements로 이동 (기존 테이블 삭제 전)
+                logger.info("📋 검사수치를 patient_measurements 테이블로 이동합니다...")
+                copied_count = _copy_measurements(conn)
+                
+                # 기존 patients 테이블 삭제하고 새 테이블로 교체
+                cursor.execute("DROP TABLE patients")
+                cursor.execute("ALTER TABLE patients_new RENAME TO patients")
+                
+                # 재구성된 patients 테이블에 모델에 선언된 인덱스 생성
+                for index in Patient.__table__.indexes:
+                    cursor.execute(str(CreateIndex(index).compile(dialect=engine.dialect)))
+                
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
             
-            db.commit()
-            print(f"✅ {len(existing_patients)}명의 검사수치 이력이 생성되었습니다.")
+            logger.info(
+                "✅ 환자 기본정보 테이블 재구성 완료\n✅ %s개의 검사수치 이력이 생성되었습니다.",
+                copied_count
+            )
             
             # 마이그레이션 검증
-            measurement_count = db.query(PatientMeasurement).count()
-            patient_count = db.query(Patient).count()
-            
-            print(f"📊 마이그레이션 결과:")
-            print(f"   - 환자: {patient_count}명")
-            print(f"   - 검사수치 이력: {measurement_count}개")
-            print("🎉 마이그레이션이 완료되었습니다!")
+            measurement_count, patient_count = cursor.execute("""
+                SELECT (SELECT COUNT(*) FROM patient_measurements),
+                       (SELECT COUNT(*) FROM patients)
+            """).fetchone()
+            
+            logger.info(
+                "📊 마이그레이션 결과:\n"
+                "   - 환자: %s명\n"
+                "   - 검사수치 이력: %s개\n"
+                "🎉 마이그레이션이 완료되었습니다!",
+                patient_count, measurement_count
+            )
             
         except Exception as e:
-            print(f"❌ 마이그레이션 중 오류 발생: {e}")
-            db.rollback()
+            logger.error("❌ 마이그레이션 중 오류 발생: %s", e)
             raise e
             
-        finally:
-            db.close()
-            
     except Exception as e:
-        print(f"❌ 데이터베이스 오류: {e}")
+        logger.error("❌ 데이터베이스 오류: %s", e)
         raise e
         
     finally:
+        # 풀로 반환되기 전에 외래키 검사를 다시 활성화
+        cursor.execute("PRAGMA foreign_keys=ON")
         conn.close()
 
 
+def _copy_measurements(conn) -> int:
+    """기존 patients 테이블의 검사수치를 patient_measurements로 복사합니다.
+
+    원본과 대상 테이블이 같은 SQLite 파일에 있으므로 INSERT ... SELECT 한 문장으로
+    처리하여 행 데이터가 Python으로 넘어오지 않도록 합니다.
+    시각은 SQLAlchemy DateTime 컬럼이 읽을 수 있는 'YYYY-MM-DD HH:MM:SS.fff' 형식(UTC)으로 저장합니다.
+
+    Returns:
+        복사된 검사수치 행 수
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO patient_measurements
+            (patient_id, weight_kg, height_cm, scr_mg_dl, egfr, crcl,
+             crcl_normalized, bsa, is_hd, measured_at, created_at)
+        SELECT id,
+               COALESCE(weight_kg, 0), COALESCE(height_cm, 0),
+               COALESCE(scr_mg_dl, 0), COALESCE(egfr, 0),
+               COALESCE(crcl, 0), COALESCE(crcl_normalized, 0),
+               COALESCE(bsa, 0), COALESCE(is_hd, 0) <> 0,
+               COALESCE(strftime('%Y-%m-%d %H:%M:%f', created_at),
+                        strftime('%Y-%m-%d %H:%M:%f', 'now')),
+               strftime('%Y-%m-%d %H:%M:%f', 'now')
+        FROM patients
+        -- 검사수치가 모두 0인 환자는 제외
+        WHERE COALESCE(weight_kg, 0) <> 0 OR COALESCE(height_cm, 0) <> 0
+           OR COALESCE(scr_mg_dl, 0) <> 0 OR COALESCE(egfr, 0) <> 0
+           OR COALESCE(crcl, 0) <> 0 OR COALESCE(bsa, 0) <> 0
+    """)
+    copied_count = cursor.rowcount
+    cursor.close()
+    return copied_count
+
+
 def rollback_migration():
     """마이그레이션을 롤백합니다 (백업에서 복원)"""
     
-    print("⏪ 마이그레이션을 롤백합니다...")
+    logger.info("⏪ 마이그레이션을 롤백합니다...")
     
-    conn = sqlite3.connect('./data/careplus.db')
+    conn = engine.raw_connection()
     cursor = conn.cursor()
     
     try:
@@ -147,9 +170,12 @@ def rollback_migration():
         """)
         
         if not cursor.fetchone():
-            print("❌ 백업 테이블을 찾을 수 없습니다.")
+            logger.error("❌ 백업 테이블을 찾을 수 없습니다.")
             return
         
+        # 엔진 연결의 ON DELETE CASCADE가 처방 데이터를 지우지 않도록 외래키 검사 비활성화
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        
         # 현재 테이블들 삭제
         cursor.execute("DROP TABLE IF EXISTS patients")
         cursor.execute("DROP TABLE IF EXISTS patient_measurements")
@@ -158,13 +184,14 @@ def rollback_migration():
         cursor.execute("ALTER TABLE patients_backup RENAME TO patients")
         
         conn.commit()
-        print("✅ 마이그레이션이 롤백되었습니다.")
+        logger.info("✅ 마이그레이션이 롤백되었습니다.")
         
     except Exception as e:
-        print(f"❌ 롤백 중 오류 발생: {e}")
+        logger.error("❌ 롤백 중 오류 발생: %s", e)
         raise e
         
     finally:
+        cursor.execute("PRAGMA foreign_keys=ON")
         conn.close()
 
 
@@ -206,4 +233,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     main() 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -6,11 +6,33 @@ from sqlalchemy.orm import sessionmaker
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data/careplus.db"
 
 # SQLite에서는 check_same_thread=False가 필요합니다
+# 파일 기반 SQLite는 QueuePool을 사용하므로, FastAPI 스레드풀 동시 요청이
+# 연결을 기다리지 않도록 풀 크기를 늘리고 PRAGMA가 적용된 연결을 재사용합니다
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30
 )
 
+
+# 파일 기반 SQLite 연결마다 동시성/성능 PRAGMA 적용
+if engine.url.get_backend_name() == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """새 연결에 WAL 모드와 PRAGMA 튜닝을 적용합니다."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")  # 쓰기 중에도 읽기 가능
+        cursor.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 커밋당 fsync 불필요
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64MB 페이지 캐시
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cursor.execute("PRAGMA busy_timeout=5000")  # "database is locked" 대신 대기
+        cursor.execute("PRAGMA foreign_keys=ON")  # ON DELETE CASCADE 활성화
+        cursor.close()
+
+
 # 세션 로컬 클래스
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -23,4 +45,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
@@ -1,27 +1,48 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, and_, select
+from sqlalchemy.orm import relationship, aliased
 from .database import Base
+from .patient_measurement import PatientMeasurement
+
+
+def _latest_measurement_join():
+    """환자별 가장 최근 검사수치 1건만 매칭하는 조인 조건 (DB에서 LIMIT 1 처리)"""
+    newer = aliased(PatientMeasurement)
+    latest_id = (
+        select(newer.id)
+        .where(newer.patient_id == PatientMeasurement.patient_id)
+        .order_by(newer.measured_at.desc(), newer.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return and_(
+        Patient.id == PatientMeasurement.patient_id,
+        PatientMeasurement.id == latest_id
+    )
 
 
 class Patient(Base):
     __tablename__ = "patients"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(Text, nullable=True)  # 선택적 필드
     sex = Column(String(1), nullable=False)  # 'M' 또는 'F'
     birth_date = Column(String(10), nullable=False)  # YYYY-MM-DD 형식
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # 중복 환자 확인(birth_date, sex, name)과 주민등록번호 조회(birth_date, sex)를
+    # 하나의 복합 인덱스로 처리 (선두 컬럼을 birth_date로 두어 두 조회 모두 사용 가능)
+    __table_args__ = (Index("ix_patient_birth_sex_name", birth_date, sex, name),)
+
     # 관계 설정
     # 한 환자는 여러 처방 주문을 가질 수 있음
-    prescription_orders = relationship("PrescriptionOrder", back_populates="patient")
-    # 한 환자는 여러 검사수치 이력을 가질 수 있음
-    measurements = relationship("PatientMeasurement", back_populates="patient", order_by="PatientMeasurement.measured_at.desc()")
-    
-    @property
-    def latest_measurement(self):
-        """가장 최근 검사수치를 반환"""
-        if self.measurements:
-            return self.measurements[0]
-        return None 
\ No newline at end of file
+    prescription_orders = relationship("PrescriptionOrder", back_populates="patient", passive_deletes=True)
+    # 한 환자는 여러 검사수치 이력을 가질 수 있음 (정렬이 필요하면 쿼리에서 order_by 지정)
+    measurements = relationship("PatientMeasurement", back_populates="patient", passive_deletes=True)
+    # 가장 최근 검사수치 (전체 이력을 로드하지 않고 1건만 조회)
+    latest_measurement = relationship(
+        PatientMeasurement,
+        primaryjoin=_latest_measurement_join,
+        uselist=False,
+        viewonly=True
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -8,8 +8,8 @@ class PatientMeasurement(Base):
     """환자 검사수치 이력 테이블"""
     __tablename__ = "patient_measurements"
 
-    id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
     
     # 검사수치들
     weight_kg = Column(Float, nullable=False)
@@ -26,4 +26,11 @@ class PatientMeasurement(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # 관계 설정: 하나의 측정값은 하나의 환자에 속함
-    patient = relationship("Patient", back_populates="measurements") 
\ No newline at end of file
+    patient = relationship("Patient", back_populates="measurements")
+
+    __table_args__ = (
+        # 환자별 최신 검사수치 조회(ORDER BY measured_at DESC, id DESC)를 정렬 없이 처리
+        # SQLite 인덱스에는 rowid(id)가 포함되므로 id만 읽는 최신 1건 조회는 인덱스만으로 처리됨
+        # 선두 컬럼이 patient_id이므로 patient_id 단독 조회(외래키, CASCADE 삭제)도 이 인덱스로 처리됨
+        Index("ix_meas_patient_latest", patient_id, measured_at.desc(), id.desc()),
+    )
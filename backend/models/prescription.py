@@ -7,8 +7,8 @@ from .database import Base
 class Prescription(Base):
     __tablename__ = "prescriptions"
 
-    id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("prescription_orders.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("prescription_orders.id", ondelete="CASCADE"), nullable=False, index=True)
     drug_id = Column(Integer, nullable=True)  # 약물 ID (외래키 또는 참조 ID)
     drug_korean_name = Column(Text, nullable=False)
     drug_ingredient = Column(Text, nullable=False)
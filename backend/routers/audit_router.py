@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from dataclasses import dataclass
 from datetime import datetime
-import json
+from types import MappingProxyType
+import logging
 import os
 
 from models.database import get_db
@@ -12,51 +16,10 @@ from models.patient_measurement import PatientMeasurement
 from models.prescription_order import PrescriptionOrder
 from models.prescription import Prescription
 from services.prescription_audit_service import get_audit_service
+from utils.json_loader import load_json_file
 
+logger = logging.getLogger(__name__)
 
-def update_prescription_order_note(db: Session, order_id: int):
-    """
-    처방 주문의 note를 감사 결과에 따라 업데이트합니다.
-    모든 처방의 audit_result가 "-"이면 "정상"을, 그렇지 않으면 "이상"을 추가합니다.
-    """
-    try:
-        print(f"🔄 처방 주문 note 업데이트 시작: order_id={order_id}")
-        
-        # 해당 주문의 모든 처방들 조회
-        prescriptions = db.query(Prescription).filter(Prescription.order_id == order_id).all()
-        
-        if not prescriptions:
-            print(f"⚠️  주문 ID {order_id}에 대한 처방이 없습니다.")
-            return
-        
-        print(f"📋 주문 ID {order_id}의 처방 개수: {len(prescriptions)}")
-        
-        # 각 처방의 audit_result 확인
-        for i, prescription in enumerate(prescriptions):
-            print(f"  처방 {i+1}: {prescription.drug_korean_name}, 감사결과: {prescription.audit_result}")
-        
-        # 모든 처방의 audit_result가 "-"인지 확인
-        all_normal = all(prescription.audit_result == "-" for prescription in prescriptions)
-        
-        # 감사 결과에 따른 상태 결정
-        audit_status = "정상" if all_normal else "이상"
-        print(f"🎯 감사 결과 판정: {audit_status} (모든 처방 정상: {all_normal})")
-        
-        # prescription_order의 note 업데이트
-        order = db.query(PrescriptionOrder).filter(PrescriptionOrder.id == order_id).first()
-        if order:
-            print(f"📝 기존 note: '{order.note}' -> 새 note: '{audit_status}'")
-            # note를 감사 결과로 완전히 대체
-            order.note = audit_status
-                
-            db.commit()
-            print(f"✅ 처방 주문 ID {order_id}의 note가 업데이트되었습니다: {audit_status}")
-        else:
-            print(f"⚠️  주문 ID {order_id}를 찾을 수 없습니다.")
-            
-    except Exception as e:
-        print(f"❌ 처방 주문 note 업데이트 중 오류: {e}")
-        db.rollback()
 
 # JSON 데이터를 모듈 레벨에서 한 번만 로드 (성능 최적화)
 def load_hira_data():
@@ -67,30 +30,51 @@ def load_hira_data():
             "data", 
             "hira_data.json"
         )
-        with open(hira_data_path, encoding="utf-8") as f:
-            data = json.load(f)
-            print(f"🗂️  HIRA 데이터 직접 로드 성공: {len(data)}개 항목")
-            return data
+        # drug_service와 같은 로더 사용
+        data = load_json_file(hira_data_path)
+        logger.info("HIRA 데이터 직접 로드 성공: %d개 항목", len(data))
+        return data
     except Exception as e:
-        print(f"❌ HIRA 데이터 로드 실패: {e}")
+        logger.error("HIRA 데이터 로드 실패: %s", e)
         return []
 
-# 모듈 레벨에서 데이터 로드 (서버 시작 시 한 번만)
+def _coerce_numeric(value, cast):
+    """숫자 문자열을 미리 변환합니다. 변환할 수 없으면 원래 값을 유지합니다."""
+    if value is None or value == "":
+        return value
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def build_hira_index(data: List[dict]) -> dict:
+    """
+    한글상품명(약품규격) → HIRA 항목 인덱스를 생성합니다.
+    같은 이름이 여러 번 나오면 기존 선형 검색과 동일하게 첫 번째 항목을 사용합니다.
+    감사 시 반복되는 int()/float() 변환을 줄이기 위해 숫자 필드는 미리 변환해 둡니다.
+    """
+    index = {}
+    for item in data:
+        if isinstance(item, dict) and "한글상품명(약품규격)" in item:
+            if "품목기준코드" in item:
+                item["품목기준코드"] = _coerce_numeric(item["품목기준코드"], int)
+            if "약품규격_숫자" in item:
+                item["약품규격_숫자"] = _coerce_numeric(item["약품규격_숫자"], float)
+            index.setdefault(item["한글상품명(약품규격)"], item)
+    return index
+
+
+# 모듈 레벨에서 데이터 로드 및 인덱스 생성 (서버 시작 시 한 번만)
 HIRA_DATA = load_hira_data()
+HIRA_INDEX = build_hira_index(HIRA_DATA)
 
 def get_drug_info_direct(drug_korean_name: str) -> Optional[dict]:
     """
     한글상품명으로 직접 약물 정보를 검색합니다.
-    성능 최적화를 위해 JSON을 직접 사용합니다.
+    성능 최적화를 위해 미리 생성한 이름 인덱스를 사용합니다 (O(1)).
     """
-    if not HIRA_DATA:
-        return None
-    
-    for item in HIRA_DATA:
-        if isinstance(item, dict) and "한글상품명(약품규격)" in item:
-            if item["한글상품명(약품규격)"] == drug_korean_name:
-                return item
-    return None
+    return HIRA_INDEX.get(drug_korean_name)
 
 # 감사 실행을 위한 통합 스키마
 class MedicationAuditInfo(BaseModel):
@@ -142,6 +126,102 @@ class AuditResponse(BaseModel):
     prescription_ids: List[int] = []
 
 
+def _parse_float(value: str) -> Optional[float]:
+    """숫자 문자열을 float로 변환합니다. 비어 있거나 숫자가 아니면 None을 반환합니다."""
+    if not value or not value.strip():
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_int(value: str, default: int = 1) -> int:
+    """숫자 문자열을 int로 변환합니다. 비어 있거나 숫자가 아니면 기본값을 반환합니다."""
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+@dataclass(slots=True)
+class ParsedPatient:
+    """검증이 끝난 감사 요청의 환자 정보 (숫자 필드 변환 완료, 내부 전달용)"""
+    name: Optional[str]
+    sex: str
+    birth_date: str
+    weight_kg: float
+    height_cm: float
+    scr_mg_dl: float
+    bsa: float
+    egfr: float
+    crcl: float
+    crcl_normalized: float
+    is_hd: bool
+
+    @classmethod
+    def from_request(cls, patient: PatientAuditInfo) -> "ParsedPatient":
+        """요청 스키마를 변환합니다. 숫자가 아닌 수치가 있으면 ValueError가 발생합니다."""
+        scr_mg_dl = float(patient.scr) if patient.scr else 0
+        # 투석 환자(is_hd=True)인 경우 SCr을 자동으로 10으로 설정
+        if patient.isOnDialysis:
+            scr_mg_dl = 10.0
+        
+        return cls(
+            name=patient.name,
+            sex='M' if patient.gender.lower() == 'male' else 'F',
+            birth_date=patient.birthDate,
+            weight_kg=float(patient.weight) if patient.weight else 0,
+            height_cm=float(patient.height) if patient.height else 0,
+            scr_mg_dl=scr_mg_dl,
+            bsa=float(patient.bsa) if patient.bsa else 0,
+            egfr=float(patient.egfr) if patient.egfr else 0,
+            crcl=float(patient.crcl) if patient.crcl else 0,
+            crcl_normalized=float(patient.crclNormalized) if patient.crclNormalized else 0,
+            is_hd=patient.isOnDialysis
+        )
+
+
+@dataclass(slots=True)
+class ParsedMedication:
+    """검증이 끝난 감사 요청의 약물 정보 (숫자 필드 변환 완료, 내부 전달용)"""
+    product_name: str
+    ingredient_name: str
+    dosage: str
+    unit: str
+    dose_value: Optional[float]       # 1회 투약용량 숫자 (비어 있거나 숫자가 아니면 None)
+    dose_multiplier: Optional[float]  # real_amount 계산용 (비어 있으면 1, 숫자가 아니면 None)
+    doses_per_day: int
+    duration_days: int
+
+    @classmethod
+    def from_request(cls, medication: MedicationAuditInfo) -> "ParsedMedication":
+        """요청 스키마를 변환합니다. 숫자가 아닌 값은 기존 규칙대로 None/기본값으로 처리합니다."""
+        dose_value = _parse_float(medication.dosage)
+        dosage_blank = not medication.dosage or not medication.dosage.strip()
+        return cls(
+            product_name=medication.productName,
+            ingredient_name=medication.ingredientName,
+            dosage=medication.dosage,
+            unit=medication.unit or "",
+            dose_value=dose_value,
+            dose_multiplier=1.0 if dosage_blank else dose_value,
+            doses_per_day=_parse_int(medication.frequency),
+            duration_days=_parse_int(medication.duration)
+        )
+
+
+# 감사 결과별 권고사항 (요청마다 다시 만들지 않도록 모듈 레벨 상수로 정의)
+RECOMMENDATION_MAP = MappingProxyType({
+    "금기": "해당 약물은 이 환자에게 금기입니다.",
+    "용량조절필요": "용량조절이 필요합니다.",
+    "투여간격조절필요": "투여 간격 조절이 필요합니다.",
+    "-": "정상적정 용량입니다."
+})
+
+
 # 감사 관련 API 라우터
 router = APIRouter(
     prefix="/api/audit",
@@ -155,343 +235,326 @@ def execute_audit(audit_request: AuditRequest, db: Session = Depends(get_db)):
     """
     처방 감사를 실행합니다. 환자 정보와 처방 정보를 데이터베이스에 저장합니다.
     """
-    try:
-        print(f"🔍 감사 요청 받음")
-        print(f"🔍 환자 정보: {audit_request.patient}")
-        print(f"🔍 약물 정보 개수: {len(audit_request.medications)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("감사 요청 받음 - 환자 정보: %s, 약물 정보 개수: %d",
+                     audit_request.patient, len(audit_request.medications))
         for i, med in enumerate(audit_request.medications):
-            print(f"🔍 약물 {i+1}: {med}")
-        
-    except Exception as validation_error:
-        print(f"❌ 요청 데이터 검증 실패: {validation_error}")
-        raise HTTPException(status_code=400, detail=f"잘못된 요청 형식: {str(validation_error)}")
+            logger.debug("약물 %d: %s", i + 1, med)
     
     try:
-        # 1. 환자 생성
-        patient_data = audit_request.patient
-        
-        # 성별 변환
-        sex_value = 'M' if patient_data.gender.lower() == 'male' else 'F'
-        
-        # 숫자 변환
-        weight_kg = float(patient_data.weight) if patient_data.weight else 0
-        height_cm = float(patient_data.height) if patient_data.height else 0
-        scr_mg_dl = float(patient_data.scr) if patient_data.scr else 0
-        bsa = float(patient_data.bsa) if patient_data.bsa else 0
-        egfr = float(patient_data.egfr) if patient_data.egfr else 0
-        crcl = float(patient_data.crcl) if patient_data.crcl else 0
-        crcl_normalized = float(patient_data.crclNormalized) if patient_data.crclNormalized else 0
-        
-        # 투석 환자(is_hd=True)인 경우 SCr을 자동으로 10으로 설정
-        if patient_data.isOnDialysis:
-            scr_mg_dl = 10.0
-            print(f"🩺 투석 환자 감지: SCr을 자동으로 10.0으로 설정")
+        # 1. 환자 생성 (검증된 요청을 내부용 dataclass로 한 번만 변환)
+        patient_data = ParsedPatient.from_request(audit_request.patient)
+        if patient_data.is_hd:
+            logger.debug("투석 환자 감지: SCr을 자동으로 10.0으로 설정")
         
         # 중복 환자 체크: name, sex, birth_date가 같은 환자가 있는지 확인
         existing_patient = db.query(Patient).filter(
             Patient.name == patient_data.name,
-            Patient.sex == sex_value,
-            Patient.birth_date == patient_data.birthDate
+            Patient.sex == patient_data.sex,
+            Patient.birth_date == patient_data.birth_date
         ).first()
         
         if existing_patient:
             # 기존 환자가 있으면 해당 환자의 ID 사용
             db_patient = existing_patient
-            print(f"👤 기존 환자 발견: ID={existing_patient.id}, 이름={existing_patient.name}")
+            logger.debug("기존 환자 발견: ID=%s", existing_patient.id)
         else:
             # 새로운 환자 생성 (기본 정보만)
             db_patient = Patient(
                 name=patient_data.name,
-                sex=sex_value,
-                birth_date=patient_data.birthDate
+                sex=patient_data.sex,
+                birth_date=patient_data.birth_date
             )
             
             db.add(db_patient)
-            db.commit()
-            db.refresh(db_patient)
-            print(f"👤 새 환자 생성: ID={db_patient.id}, 이름={db_patient.name}")
+            db.flush()  # ID만 할당받고 커밋은 마지막에 한 번만 수행
+            logger.debug("새 환자 생성: ID=%s", db_patient.id)
         
-        # 새로운 검사수치 이력 생성
+        # 검사수치와 처방 주문은 같은 시각으로 기록
         current_time = datetime.now()
+        
+        # 새로운 검사수치 이력 생성
         db_measurement = PatientMeasurement(
             patient_id=db_patient.id,
-            weight_kg=weight_kg,
-            height_cm=height_cm,
-            scr_mg_dl=scr_mg_dl,
-            egfr=egfr,
-            crcl=crcl,
-            crcl_normalized=crcl_normalized,
-            bsa=bsa,
-            is_hd=patient_data.isOnDialysis,
+            weight_kg=patient_data.weight_kg,
+            height_cm=patient_data.height_cm,
+            scr_mg_dl=patient_data.scr_mg_dl,
+            egfr=patient_data.egfr,
+            crcl=patient_data.crcl,
+            crcl_normalized=patient_data.crcl_normalized,
+            bsa=patient_data.bsa,
+            is_hd=patient_data.is_hd,
             measured_at=current_time
         )
         
         db.add(db_measurement)
-        db.commit()
-        db.refresh(db_measurement)
-        print(f"📊 새로운 검사수치 이력 생성: ID={db_measurement.id}, 측정시간={current_time}")
         
-        # 2. 처방 주문 생성
-        current_time = datetime.now()
-        print(f"🕒 현재 시간: {current_time}")
-        
-        db_order = PrescriptionOrder(
-            patient_id=db_patient.id,
-            submitted_at=current_time,
-            note=None  # 나중에 감사 결과에 따라 업데이트됨
-        )
+        # 2. 개별 처방 감사 (주문은 감사 결과로 note를 정한 뒤 처방과 함께 저장)
+        medications = [ParsedMedication.from_request(medication) for medication in audit_request.medications]
+        db_prescriptions = []
         
-        print(f"📦 생성된 PrescriptionOrder: patient_id={db_patient.id}, submitted_at={current_time}")
+        # 감사 루프 전에 모든 약물 정보를 이름 인덱스로 한 번에 조회
+        # (숫자 필드는 인덱스 생성 시 이미 변환됨)
+        drug_infos = [get_drug_info_direct(medication.product_name) for medication in medications]
         
-        db.add(db_order)
-        db.commit()
-        db.refresh(db_order)
+        # 최적화된 감사 서비스 사용 (싱글톤, 루프 밖에서 한 번만 조회)
+        audit_service = get_audit_service()
         
-        # 3. 개별 처방들 생성
-        prescription_ids = []
+        # 환자 데이터 구성 (최신 검사수치 사용, 모든 처방에 공통)
+        patient_audit_data = {
+            "weight_kg": patient_data.weight_kg,
+            "bsa": patient_data.bsa,
+            "crcl": patient_data.crcl,
+            "crcl_normalization": patient_data.crcl_normalized,
+            "egfr": patient_data.egfr,
+            "scr_mg_dl": patient_data.scr_mg_dl,
+            "is_hd": patient_data.is_hd
+        }
         
-        for medication in audit_request.medications:
-            print(f"💊 처방 처리 중: {medication.productName}")
-            
-            # 약물명으로 상세 정보 조회
+        for medication, drug_info in zip(medications, drug_infos):
             drug_id = None
             calculated_real_amount = None
             
-            try:
-                # drug_service를 통해 약물 정보 조회
-                drug_info = get_drug_info_direct(medication.productName)
+            if drug_info and "품목기준코드" in drug_info:
+                item_code = drug_info["품목기준코드"]
                 
-                if drug_info and "품목기준코드" in drug_info:
+                if item_code and not isinstance(item_code, int):
+                    logger.warning("품목기준코드 변환 실패: %s", item_code)
+                else:
                     # 품목기준코드를 drug_id로 사용
-                    drug_id = int(drug_info["품목기준코드"]) if drug_info["품목기준코드"] else None
-                    print(f"🔍 품목기준코드 찾음: {drug_id}")
+                    drug_id = item_code or None
                     
-                    # 약품규격_숫자 필드에서 직접 값 가져와서 real_amount 계산
-                    if "약품규격_숫자" in drug_info:
-                        spec_amount = drug_info["약품규격_숫자"]
-                        
-                        if spec_amount is not None:
-                            try:
-                                spec_amount_float = float(spec_amount)
-                                
-                                # dose_amount와 곱하여 real_amount 계산
-                                try:
-                                    dose_value = float(medication.dosage) if medication.dosage and medication.dosage.strip() else 1
-                                    calculated_real_amount = spec_amount_float * dose_value
-                                    print(f"📊 real_amount 계산: {spec_amount_float} × {dose_value} = {calculated_real_amount}")
-                                except ValueError:
-                                    print(f"⚠️  dose_amount 변환 실패: {medication.dosage}")
-                            except ValueError:
-                                print(f"⚠️  약품규격_숫자 변환 실패: {spec_amount}")
+                    # 약품규격_숫자와 dose_amount를 곱하여 real_amount 계산
+                    spec_amount = drug_info.get("약품규격_숫자")
+                    if isinstance(spec_amount, float):
+                        if medication.dose_multiplier is not None:
+                            calculated_real_amount = spec_amount * medication.dose_multiplier
                         else:
-                            print(f"⚠️  약품규격_숫자 값이 없음")
-                    else:
-                        print(f"⚠️  약품규격_숫자 필드가 없음")
-                else:
-                    print(f"⚠️  약물 정보를 찾을 수 없음: {medication.productName}")
-                    
-            except Exception as e:
-                print(f"❌ 약물 정보 조회 중 오류: {e}")
+                            logger.debug("dose_amount 변환 실패: %s", medication.dosage)
+                    elif spec_amount is not None:
+                        logger.debug("약품규격_숫자 변환 실패: %s", spec_amount)
+            else:
+                logger.debug("약물 정보를 찾을 수 없음: %s", medication.product_name)
             
-            # 기본 용량을 숫자로 변환 시도 (계산된 값이 없는 경우 대체)
-            fallback_real_amount = None
+            # 계산된 값이 없으면 기본 용량 숫자값으로 대체
             if calculated_real_amount is None:
-                try:
-                    if medication.dosage and medication.dosage.strip():
-                        fallback_real_amount = float(medication.dosage)
-                except ValueError:
-                    pass
+                real_amount = medication.dose_value
+            else:
+                real_amount = calculated_real_amount or None
             
-            # 투약 횟수와 기간을 숫자로 변환
-            try:
-                doses_per_day = int(medication.frequency) if medication.frequency else 1
-            except ValueError:
-                doses_per_day = 1
+            # 실제 감사 로직 실행 (drug_id가 없으면 try 블록에 들어가지 않고 바로 대기중 처리)
+            if not drug_id:
+                audit_result = "대기중"
+                information = "약물 정보를 찾을 수 없어 감사할 수 없습니다."
+            else:
+                # 처방 데이터 구성
+                prescription_audit_data = {
+                    "dose_amount": medication.dosage,
+                    "real_amount": real_amount,
+                    "doses_per_day": medication.doses_per_day
+                }
                 
-            try:
-                duration_days = int(medication.duration) if medication.duration else 1
-            except ValueError:
-                duration_days = 1
-            
-            # 실제 감사 로직 실행
-            print(f"🔍 감사 실행 중 - 약물: {medication.productName}, drug_id: {drug_id}")
-            
-            audit_result = "대기중"
-            information = "감사 대기중"
-            
-            try:
-                if drug_id:
-                    # 최적화된 감사 서비스 사용 (싱글톤)
-                    audit_service = get_audit_service()
-                    
-                    # 환자 데이터 구성 (최신 검사수치 사용)
-                    patient_audit_data = {
-                        "weight_kg": db_measurement.weight_kg,
-                        "bsa": db_measurement.bsa,
-                        "crcl": db_measurement.crcl,
-                        "crcl_normalization": db_measurement.crcl_normalized,
-                        "egfr": db_measurement.egfr,
-                        "scr_mg_dl": db_measurement.scr_mg_dl,
-                        "is_hd": db_measurement.is_hd
-                    }
-                    
-                    # 처방 데이터 구성
-                    prescription_audit_data = {
-                        "dose_amount": medication.dosage,
-                        "real_amount": calculated_real_amount or fallback_real_amount,
-                        "doses_per_day": doses_per_day
-                    }
-                    
-                    # 감사 실행
+                # 감사 실행 (예외 처리는 감사 호출에만 적용)
+                try:
                     audit_result = audit_service.audit_prescription(
                         patient_audit_data, 
                         prescription_audit_data, 
                         drug_id
                     )
-                    
-                    # 감사 결과에 따른 권고사항 생성
-                    recommendation_map = {
-                        "금기": "해당 약물은 이 환자에게 금기입니다.",
-                        "용량조절필요": "용량조절이 필요합니다.",
-                        "투여간격조절필요": "투여 간격 조절이 필요합니다.",
-                        "-": "정상적정 용량입니다."
-                    }
-                    
-                    information = recommendation_map.get(audit_result, "감사 완료")
-                    
-                    print(f"✅ 감사 완료 - 결과: {audit_result}, 권고: {information}")
-                else:
-                    print(f"⚠️  drug_id가 없어 감사를 수행할 수 없습니다.")
+                except Exception as audit_error:
+                    logger.warning("감사 실행 오류 (%s): %s", medication.product_name, audit_error)
                     audit_result = "대기중"
-                    information = "약물 정보를 찾을 수 없어 감사할 수 없습니다."
-                    
-            except Exception as audit_error:
-                print(f"❌ 감사 실행 오류: {audit_error}")
-                audit_result = "대기중"
-                information = f"감사 실행 중 오류 발생: {str(audit_error)}"
+                    information = f"감사 실행 중 오류 발생: {str(audit_error)}"
+                else:
+                    # 감사 결과에 따른 권고사항 생성
+                    information = RECOMMENDATION_MAP.get(audit_result, "감사 완료")
             
             db_prescription = Prescription(
-                order_id=db_order.id,
                 drug_id=drug_id,  # 품목기준코드로 설정
-                drug_korean_name=medication.productName,
-                drug_ingredient=medication.ingredientName,
+                drug_korean_name=medication.product_name,
+                drug_ingredient=medication.ingredient_name,
                 dose_amount=medication.dosage,
-                dose_unit=medication.unit or "",
-                real_amount=calculated_real_amount or fallback_real_amount,  # 계산된 값 또는 대체값
-                doses_per_day=doses_per_day,
-                duration_days=duration_days,
+                dose_unit=medication.unit,
+                real_amount=real_amount,  # 계산된 값 또는 대체값
+                doses_per_day=medication.doses_per_day,
+                duration_days=medication.duration_days,
                 audit_result=audit_result,
                 information=information
             )
             
-            db.add(db_prescription)
-            db.commit()
-            db.refresh(db_prescription)
-            
-            prescription_ids.append(db_prescription.id)
+            db_prescriptions.append(db_prescription)
         
-        # 모든 처방의 감사가 완료된 후 prescription_order의 note를 업데이트
-        update_prescription_order_note(db, db_order.id)
+        # 3. 처방 주문 생성: 감사 결과로 note를 미리 결정해 INSERT 한 번으로 저장
+        #    (처방이 없으면 None, 이후 UPDATE 불필요)
+        note = None
+        if db_prescriptions:
+            all_normal = all(p.audit_result == "-" for p in db_prescriptions)
+            note = "정상" if all_normal else "이상"
         
-        return AuditResponse(
-            success=True,
-            message=f"처방 감사가 완료되었습니다. 환자 ID: {db_patient.id}, 처방 주문 ID: {db_order.id}",
+        db_order = PrescriptionOrder(
             patient_id=db_patient.id,
-            order_id=db_order.id,
+            submitted_at=current_time,
+            note=note,
+            prescriptions=db_prescriptions  # 주문 INSERT 후 order_id가 채워짐
+        )
+        
+        # 환자, 검사수치, 주문, 처방을 하나의 트랜잭션으로 저장
+        db.add(db_order)
+        db.flush()
+        patient_id = db_patient.id
+        order_id = db_order.id
+        prescription_ids = [p.id for p in db_prescriptions]
+        db.commit()
+        
+        # 서버에서 만든 응답이므로 검증 없이 생성하고 바로 직렬화 (response_model 재검증 생략)
+        response = AuditResponse.model_construct(
+            success=True,
+            message=f"처방 감사가 완료되었습니다. 환자 ID: {patient_id}, 처방 주문 ID: {order_id}",
+            patient_id=patient_id,
+            order_id=order_id,
             prescription_ids=prescription_ids
         )
+        return ORJSONResponse(content=response.model_dump())
         
     except Exception as e:
-        print(f"❌ 감사 실행 에러: {type(e).__name__}: {str(e)}")
-        import traceback
-        print(f"❌ 에러 트레이스: {traceback.format_exc()}")
+        logger.exception("감사 실행 에러")
         db.rollback()
         raise HTTPException(status_code=400, detail=f"감사 실행 실패: {str(e)}")
 
 
 @router.get("/history")
-def get_audit_history(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+def get_audit_history(
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
     """
     감사 이력을 조회합니다. 처방 작성 시점의 환자 상태를 반영합니다.
+    cursor/cursor_id(이전 응답의 next_cursor/next_cursor_id)를 주면 그 주문 다음부터 조회합니다.
+    (작성 시각이 같은 주문은 id로 구분하며, 커서를 주면 skip은 무시하고 OFFSET 스캔을 하지 않음)
     """
     try:
-        # 최근 처방 주문들을 조회 (환자 정보와 함께)
-        orders = (
-            db.query(PrescriptionOrder)
-            .join(Patient)
-            .order_by(PrescriptionOrder.submitted_at.desc())
-            .offset(skip)
+        # 최근 처방 주문들을 환자 정보와 함께 필요한 컬럼만 조회 (ORM 객체 생성 생략)
+        orders_query = (
+            select(
+                PrescriptionOrder.id,
+                PrescriptionOrder.patient_id,
+                PrescriptionOrder.submitted_at,
+                Patient.name,
+                Patient.sex,
+                Patient.birth_date
+            )
+            .join(Patient, Patient.id == PrescriptionOrder.patient_id)
+            .order_by(PrescriptionOrder.submitted_at.desc(), PrescriptionOrder.id.desc())
             .limit(limit)
-            .all()
         )
-        
-        history = []
-        for order in orders:
-            # 해당 주문의 처방들 조회
-            prescriptions = (
-                db.query(Prescription)
-                .filter(Prescription.order_id == order.id)
-                .all()
+        if cursor is None:
+            orders_query = orders_query.offset(skip)
+        elif cursor_id is None:
+            orders_query = orders_query.where(PrescriptionOrder.submitted_at < cursor)
+        else:
+            orders_query = orders_query.where(
+                or_(
+                    PrescriptionOrder.submitted_at < cursor,
+                    and_(
+                        PrescriptionOrder.submitted_at == cursor,
+                        PrescriptionOrder.id < cursor_id
+                    )
+                )
             )
+        orders = db.execute(orders_query).mappings().all()
+        
+        order_ids = [order["id"] for order in orders]
+        prescriptions_by_order = {order_id: [] for order_id in order_ids}
+        measurements_by_order = {}
+        
+        if order_ids:
+            # 페이지 내 모든 주문의 처방을 한 번에 조회
+            prescription_rows = db.execute(
+                select(
+                    Prescription.order_id,
+                    Prescription.id,
+                    Prescription.drug_korean_name.label("drug_name"),
+                    Prescription.audit_result,
+                    Prescription.information,
+                    Prescription.dose_amount,
+                    Prescription.dose_unit,
+                    Prescription.doses_per_day,
+                    Prescription.duration_days
+                )
+                .where(Prescription.order_id.in_(order_ids))
+                .order_by(Prescription.id)
+            ).mappings()
+            for row in prescription_rows:
+                prescription = dict(row)
+                prescriptions_by_order[prescription.pop("order_id")].append(prescription)
             
-            # 처방 작성 시점(submitted_at) 이전의 가장 최근 환자 검사수치 조회
-            latest_measurement = (
-                db.query(PatientMeasurement)
-                .filter(
-                    PatientMeasurement.patient_id == order.patient_id,
-                    PatientMeasurement.measured_at <= order.submitted_at
+            # 주문별로 처방 작성 시점(submitted_at) 이전의 가장 최근 환자 검사수치를 한 번에 조회
+            latest_measurement_id = (
+                select(PatientMeasurement.id)
+                .where(
+                    PatientMeasurement.patient_id == PrescriptionOrder.patient_id,
+                    PatientMeasurement.measured_at <= PrescriptionOrder.submitted_at
                 )
-                .order_by(PatientMeasurement.measured_at.desc())
-                .first()
+                .order_by(PatientMeasurement.measured_at.desc(), PatientMeasurement.id.desc())
+                .limit(1)
+                .correlate(PrescriptionOrder)
+                .scalar_subquery()
             )
-            
-            # 환자 기본 정보
-            patient_info = {
-                "id": order.patient.id,
-                "name": order.patient.name,
-                "sex": order.patient.sex,
-                "birth_date": order.patient.birth_date
-            }
-            
-            # 검사수치 정보 (있는 경우에만)
-            measurement_info = None
-            if latest_measurement:
-                measurement_info = {
-                    "weight_kg": latest_measurement.weight_kg,
-                    "height_cm": latest_measurement.height_cm,
-                    "scr_mg_dl": latest_measurement.scr_mg_dl,
-                    "bsa": latest_measurement.bsa,
-                    "egfr": latest_measurement.egfr,
-                    "crcl": latest_measurement.crcl,
-                    "crcl_normalized": latest_measurement.crcl_normalized,
-                    "is_hd": latest_measurement.is_hd,
-                    "measured_at": latest_measurement.measured_at
-                }
+            measurement_rows = db.execute(
+                select(
+                    PrescriptionOrder.id.label("order_id"),
+                    PatientMeasurement.weight_kg,
+                    PatientMeasurement.height_cm,
+                    PatientMeasurement.scr_mg_dl,
+                    PatientMeasurement.bsa,
+                    PatientMeasurement.egfr,
+                    PatientMeasurement.crcl,
+                    PatientMeasurement.crcl_normalized,
+                    PatientMeasurement.is_hd,
+                    PatientMeasurement.measured_at
+                )
+                .join(PatientMeasurement, PatientMeasurement.id == latest_measurement_id)
+                .where(PrescriptionOrder.id.in_(order_ids))
+            ).mappings()
+            for row in measurement_rows:
+                measurement = dict(row)
+                measurements_by_order[measurement.pop("order_id")] = measurement
+        
+        history = []
+        for order in orders:
+            prescriptions = prescriptions_by_order[order["id"]]
             
             history.append({
-                "order_id": order.id,
-                "patient_id": order.patient_id,
-                "patient_name": order.patient.name,
-                "submitted_at": order.submitted_at,
+                "order_id": order["id"],
+                "patient_id": order["patient_id"],
+                "patient_name": order["name"],
+                "submitted_at": order["submitted_at"],
                 "prescription_count": len(prescriptions),
-                "patient": patient_info,
-                "measurement": measurement_info,
-                "prescriptions": [
-                    {
-                        "id": p.id,
-                        "drug_name": p.drug_korean_name,
-                        "audit_result": p.audit_result,
-                        "information": p.information,
-                        "dose_amount": p.dose_amount,
-                        "dose_unit": p.dose_unit,
-                        "doses_per_day": p.doses_per_day,
-                        "duration_days": p.duration_days
-                    }
-                    for p in prescriptions
-                ]
+                "patient": {
+                    "id": order["patient_id"],
+                    "name": order["name"],
+                    "sex": order["sex"],
+                    "birth_date": order["birth_date"]
+                },
+                # 검사수치 정보 (있는 경우에만)
+                "measurement": measurements_by_order.get(order["id"]),
+                "prescriptions": prescriptions
             })
         
-        return {"history": history}
+        # 다음 페이지 조회용 커서 (마지막 주문의 작성 시각과 id)
+        if len(orders) == limit:
+            next_cursor, next_cursor_id = orders[-1]["submitted_at"], orders[-1]["id"]
+        else:
+            next_cursor = next_cursor_id = None
+        
+        return ORJSONResponse(content={
+            "history": history,
+            "next_cursor": next_cursor,
+            "next_cursor_id": next_cursor_id
+        })
         
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"감사 이력 조회 실패: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=f"감사 이력 조회 실패: {str(e)}")
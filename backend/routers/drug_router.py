@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Query, HTTPException
-from typing import List
-from services.drug_service import drug_service
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
+from services.drug_service import get_drug_service
 from pydantic import BaseModel
 import json
 
@@ -18,7 +19,7 @@ class BatchDrugSearchRequest(BaseModel):
 class DrugSearchResult(BaseModel):
     drug_name: str
     found: bool
-    drug_data: dict = None
+    drug_data: Optional[dict] = None
 
 
 @router.get("", response_model=List[str])
@@ -29,7 +30,7 @@ def search_drugs(query: str = Query("", description="검색할 약물명")):
     - **query**: 검색어 (한글 상품명)
     - 최대 20개까지 결과 반환
     """
-    return drug_service.search_drugs_by_name(query)
+    return get_drug_service().search_drugs_by_name(query)
 
 
 @router.get("/search")
@@ -38,7 +39,7 @@ def search_drugs_with_details(name: str = Query(..., description="검색할 약
     약물명으로 상세 정보를 검색합니다 (프론트엔드 최적화용).
     """
     # drug_service의 기존 메서드를 사용
-    drug_info = drug_service.get_drug_info_by_name(name)
+    drug_info = get_drug_service().get_drug_info_by_name(name)
     
     if drug_info:
         return [{
@@ -59,7 +60,7 @@ def get_drug_info(drug_name: str = Query(..., description="약물명")):
     
     - **drug_name**: 정확한 약물명
     """
-    drug_info = drug_service.get_drug_info_by_name(drug_name)
+    drug_info = get_drug_service().get_drug_info_by_name(drug_name)
     if drug_info is None:
         return {"message": "약물 정보를 찾을 수 없습니다"}
     return drug_info
@@ -70,6 +71,7 @@ def get_drug_count():
     """
     전체 약물 데이터 개수를 반환합니다.
     """
+    drug_service = get_drug_service()
     return {
         "hira_count": drug_service.get_total_drug_count(),
         "fda_count": drug_service.get_total_fda_count()
@@ -83,7 +85,7 @@ def get_english_ingredient(drug_name: str = Query(..., description="한글상품
     
     - **drug_name**: 정확한 한글상품명(약품규격)
     """
-    english_ingredient = drug_service.get_english_ingredient_by_korean_name(drug_name)
+    english_ingredient = get_drug_service().get_english_ingredient_by_korean_name(drug_name)
     if english_ingredient is None:
         return {"message": "영문성분명을 찾을 수 없습니다", "english_ingredient": None}
     return {"english_ingredient": english_ingredient}
@@ -96,7 +98,7 @@ def get_drug_unit(drug_name: str = Query(..., description="한글상품명(약
     
     - **drug_name**: 정확한 한글상품명(약품규격)
     """
-    unit = drug_service.get_unit_by_korean_name(drug_name)
+    unit = get_drug_service().get_unit_by_korean_name(drug_name)
     return {"unit": unit, "drug_name": drug_name}
 
 
@@ -107,7 +109,7 @@ def get_drug_details_with_ingredient(drug_name: str = Query(..., description="
     
     - **drug_name**: 정확한 한글상품명(약품규격)
     """
-    details = drug_service.get_drug_complete_info(drug_name)
+    details = get_drug_service().get_drug_complete_info(drug_name)
     if details is None:
         return {"message": "약물 정보를 찾을 수 없습니다"}
     return details 
@@ -117,35 +119,19 @@ def get_drug_details_with_ingredient(drug_name: str = Query(..., description="
 async def batch_search_drugs(request: BatchDrugSearchRequest):
     """여러 약물을 한 번에 조회하는 배치 API (최적화됨)"""
     try:
+        # 미리 생성된 이름 → 요약 인덱스로 조회 (서버 데이터이므로 응답 검증 생략)
+        get_summary = get_drug_service().get_drug_summary_by_name
         results = []
         
         for drug_name in request.drug_names:
-            # drug_service의 메모리 캐시된 데이터 사용 (파일 I/O 제거!)
-            drug_info = drug_service.get_drug_info_by_name(drug_name)
-            
-            if drug_info:
-                # HIRA 데이터 구조에 맞춰 매핑
-                results.append(DrugSearchResult(
-                    drug_name=drug_name,
-                    found=True,
-                    drug_data={
-                        "제품명": drug_info.get("한글상품명(약품규격)"),
-                        "품목기준코드": drug_info.get("품목기준코드"),
-                        "업체명": drug_info.get("업체명"),
-                        "성분명": drug_info.get("성분명"),
-                        "급여구분": drug_info.get("급여구분"),
-                        "제형구분": drug_info.get("제형구분"),
-                        "약품규격_숫자": drug_info.get("약품규격_숫자")
-                    }
-                ))
-            else:
-                results.append(DrugSearchResult(
-                    drug_name=drug_name,
-                    found=False,
-                    drug_data=None
-                ))
+            drug_data = get_summary(drug_name)
+            results.append({
+                "drug_name": drug_name,
+                "found": drug_data is not None,
+                "drug_data": drug_data
+            })
         
-        return results
+        return ORJSONResponse(content=results)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"배치 약물 검색 오류: {str(e)}") 
\ No newline at end of file
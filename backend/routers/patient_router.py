@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import DateTime, exists, func, insert, lambda_stmt, literal, select, tuple_
+from sqlalchemy.orm import Session, raiseload, selectinload
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from hashlib import blake2b
+from pydantic import BaseModel, ConfigDict, Field
 
 from models.database import get_db
 from models.patient import Patient
@@ -16,6 +20,8 @@ from utils.resident_number import (
 # 환자 관련 API 라우터
 router = APIRouter(prefix="/api/patients", tags=["patients"])
 
+logger = logging.getLogger(__name__)
+
 
 class PatientCreate(BaseModel):
     """환자 생성 요청 (기본 정보만)"""
@@ -49,16 +55,30 @@ class PatientCreateWithMeasurement(BaseModel):
     measurement: PatientMeasurementCreate = Field(..., description="검사수치")
 
 
+class PatientCreateDirect(BaseModel):
+    """NewAudit용 환자 정보와 검사수치 동시 생성 요청 (주민등록번호 없음)"""
+    name: Optional[str] = Field(None, description="환자 이름")
+    sex: Optional[str] = Field(None, description="성별 (M/F)")
+    birth_date: Optional[str] = Field(None, description="생년월일 (YYYY-MM-DD)")
+    weight_kg: float = Field(0.0, description="체중 (kg)")
+    height_cm: float = Field(0.0, description="키 (cm)")
+    scr_mg_dl: float = Field(0.0, description="혈청 크레아티닌 (mg/dL)")
+    egfr: float = Field(0.0, description="eGFR")
+    crcl: float = Field(0.0, description="CrCl")
+    crcl_normalized: float = Field(0.0, description="CrCl 정규화")
+    bsa: float = Field(0.0, description="체표면적 (m²)")
+    is_hd: bool = Field(False, description="투석 여부")
+
+
 class PatientResponse(BaseModel):
     """환자 기본 정보 응답"""
     id: int
-    name: str
+    name: Optional[str] = None  # 감사 실행으로 생성된 환자는 이름이 없을 수 있음
     sex: str
     birth_date: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PatientMeasurementResponse(BaseModel):
@@ -75,21 +95,19 @@ class PatientMeasurementResponse(BaseModel):
     measured_at: datetime
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PatientInfoResponse(BaseModel):
     """환자 기본정보와 최신 검사수치 응답"""
     id: int
-    name: str
+    name: Optional[str] = None  # 감사 실행으로 생성된 환자는 이름이 없을 수 있음
     sex: str
     birth_date: str
     created_at: datetime
     latest_measurement: Optional[PatientMeasurementResponse] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PatientSearchResponse(BaseModel):
@@ -106,6 +124,35 @@ class PatientCreateResponse(BaseModel):
     message: str
 
 
+# 추이 조회 가능한 검사수치 컬럼 (모듈 로드 시 한 번만 구성)
+TREND_COLUMNS = {
+    "weight_kg": PatientMeasurement.weight_kg,
+    "height_cm": PatientMeasurement.height_cm,
+    "scr_mg_dl": PatientMeasurement.scr_mg_dl,
+    "egfr": PatientMeasurement.egfr,
+    "crcl": PatientMeasurement.crcl,
+    "crcl_normalized": PatientMeasurement.crcl_normalized,
+    "bsa": PatientMeasurement.bsa,
+}
+_INVALID_TREND_PARAMETER_DETAIL = f"잘못된 파라미터입니다. 사용 가능한 파라미터: {', '.join(TREND_COLUMNS)}"
+
+# 중복 일괄 체크 시 IN 절 하나에 넣을 최대 후보 수
+DUPLICATE_CHECK_BATCH_SIZE = 200
+
+
+def _patient_exists(db: Session, patient_id: int) -> bool:
+    """환자 행을 로드하지 않고 EXISTS로 존재 여부만 확인합니다."""
+    # lambda_stmt: 문장 구성/컴파일 결과를 캐시하고 patient_id만 바인딩 파라미터로 교체
+    stmt = lambda_stmt(lambda: select(exists().where(Patient.id == patient_id)))
+    return db.execute(stmt).scalar()
+
+
+def _weak_etag(*version) -> str:
+    """버전 값들로 약한 ETag(W/"...")를 만듭니다."""
+    digest = blake2b(repr(version).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
 # 모든 환자 조회 (가장 먼저 정의)
 @router.get("", response_model=List[PatientInfoResponse])
 def get_all_patients(
@@ -116,39 +163,19 @@ def get_all_patients(
     """
     모든 환자의 기본정보와 최신 검사수치를 조회합니다.
     """
-    try:
-        # 환자 목록 조회
-        patients = (
-            db.query(Patient)
-            .order_by(Patient.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+    # 환자 페이지를 먼저 조회한 뒤, 해당 환자들의 최신 검사수치만 selectinload로 한 번에 조회
+    # (검사수치 테이블 전체에 윈도 함수를 돌리지 않고 쿼리 2번으로 처리)
+    return (
+        db.query(Patient)
+        .options(
+            selectinload(Patient.latest_measurement),
+            raiseload("*")  # 응답에 필요 없는 관계의 지연 로딩(N+1) 방지
         )
-        
-        result = []
-        for patient in patients:
-            # 각 환자의 최신 검사수치 조회
-            latest_measurement = (
-                db.query(PatientMeasurement)
-                .filter(PatientMeasurement.patient_id == patient.id)
-                .order_by(PatientMeasurement.measured_at.desc())
-                .first()
-            )
-            
-            result.append(PatientInfoResponse(
-                id=patient.id,
-                name=patient.name,
-                sex=patient.sex,
-                birth_date=patient.birth_date,
-                created_at=patient.created_at,
-                latest_measurement=latest_measurement
-            ))
-        
-        return result
-        
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"환자 목록 조회 실패: {str(e)}")
+        .order_by(Patient.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
 
 # 주민등록번호로 환자 검색 (구체적인 경로를 먼저 정의)
@@ -161,26 +188,9 @@ def search_patient_by_resident(resident_number: str, db: Session = Depends(get_d
         patient = find_patient_by_resident_number(db, resident_number)
         
         if patient:
-            # 최신 검사수치 조회
-            latest_measurement = (
-                db.query(PatientMeasurement)
-                .filter(PatientMeasurement.patient_id == patient.id)
-                .order_by(PatientMeasurement.measured_at.desc())
-                .first()
-            )
-            
-            patient_info = PatientInfoResponse(
-                id=patient.id,
-                name=patient.name,
-                sex=patient.sex,
-                birth_date=patient.birth_date,
-                created_at=patient.created_at,
-                latest_measurement=latest_measurement
-            )
-            
             return PatientSearchResponse(
                 found=True,
-                patient=patient_info,
+                patient=patient,  # from_attributes로 변환 (최신 검사수치 1건만 조회)
                 message="환자를 찾았습니다"
             )
         else:
@@ -196,8 +206,6 @@ def search_patient_by_resident(resident_number: str, db: Session = Depends(get_d
             patient=None,
             message=f"주민등록번호 형식 오류: {e.detail}"
         )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"환자 검색 실패: {str(e)}")
 
 
 # 환자 검색 (이름, 생년월일, 성별 기반)
@@ -211,50 +219,30 @@ def search_patient_by_info(
     """
     환자 이름, 생년월일, 성별로 환자를 검색합니다.
     """
-    try:
-        # 환자 검색
-        patient = (
-            db.query(Patient)
-            .filter(
-                Patient.name == name,
-                Patient.birth_date == birth_date,
-                Patient.sex == sex
-            )
-            .first()
+    # 환자 검색 (최신 검사수치는 selectinload로 함께 조회)
+    patient = (
+        db.query(Patient)
+        .options(selectinload(Patient.latest_measurement))
+        .filter(
+            Patient.name == name,
+            Patient.birth_date == birth_date,
+            Patient.sex == sex
+        )
+        .first()
+    )
+    
+    if patient:
+        return PatientSearchResponse(
+            found=True,
+            patient=patient,  # from_attributes로 변환 (최신 검사수치 1건만 조회)
+            message="환자를 찾았습니다"
+        )
+    else:
+        return PatientSearchResponse(
+            found=False,
+            patient=None,
+            message="환자를 찾을 수 없습니다"
         )
-        
-        if patient:
-            # 최신 검사수치 조회
-            latest_measurement = (
-                db.query(PatientMeasurement)
-                .filter(PatientMeasurement.patient_id == patient.id)
-                .order_by(PatientMeasurement.measured_at.desc())
-                .first()
-            )
-            
-            patient_info = PatientInfoResponse(
-                id=patient.id,
-                name=patient.name,
-                sex=patient.sex,
-                birth_date=patient.birth_date,
-                created_at=patient.created_at,
-                latest_measurement=latest_measurement
-            )
-            
-            return PatientSearchResponse(
-                found=True,
-                patient=patient_info,
-                message="환자를 찾았습니다"
-            )
-        else:
-            return PatientSearchResponse(
-                found=False,
-                patient=None,
-                message="환자를 찾을 수 없습니다"
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"환자 검색 실패: {str(e)}")
 
 
 # 환자 중복 체크 (이름, 생년월일, 성별 기반)
@@ -268,33 +256,59 @@ def check_patient_duplicate(
     """
     환자 이름, 생년월일, 성별로 중복 환자가 있는지 확인합니다.
     """
-    try:
-        # 환자 검색
-        patient = (
-            db.query(Patient)
-            .filter(
-                Patient.name == name,
-                Patient.birth_date == birth_date,
-                Patient.sex == sex
-            )
-            .first()
+    # 환자 검색
+    patient = (
+        db.query(Patient)
+        .filter(
+            Patient.name == name,
+            Patient.birth_date == birth_date,
+            Patient.sex == sex
         )
-        
-        if patient:
-            return {
-                "is_duplicate": True,
-                "message": "이미 등록된 환자입니다",
-                "patient_id": patient.id,
-                "patient_name": patient.name
-            }
-        else:
-            return {
-                "is_duplicate": False,
-                "message": "등록 가능한 환자입니다"
-            }
-            
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"중복 체크 실패: {str(e)}")
+        .first()
+    )
+    
+    if patient:
+        return {
+            "is_duplicate": True,
+            "message": "이미 등록된 환자입니다",
+            "patient_id": patient.id,
+            "patient_name": patient.name
+        }
+    else:
+        return {
+            "is_duplicate": False,
+            "message": "등록 가능한 환자입니다"
+        }
+
+
+# 환자 중복 일괄 체크 (다건 등록용)
+@router.post("/check-duplicate/batch", response_model=List[dict])
+def check_patient_duplicate_batch(candidates: List[PatientCreate], db: Session = Depends(get_db)):
+    """
+    여러 환자 후보의 중복 여부를 한 번에 확인합니다.
+    결과는 요청 순서와 동일한 순서로 반환됩니다.
+    """
+    keys = [(c.name, c.birth_date, c.sex) for c in candidates]
+    unique_keys = list(dict.fromkeys(keys))
+    identity = tuple_(Patient.name, Patient.birth_date, Patient.sex)
+    
+    # (이름, 생년월일, 성별) -> 가장 먼저 등록된 환자 ID
+    found = {}
+    for start in range(0, len(unique_keys), DUPLICATE_CHECK_BATCH_SIZE):
+        chunk = unique_keys[start:start + DUPLICATE_CHECK_BATCH_SIZE]
+        rows = (
+            db.query(Patient.name, Patient.birth_date, Patient.sex, func.min(Patient.id))
+            .filter(identity.in_(chunk))
+            .group_by(Patient.name, Patient.birth_date, Patient.sex)
+            .all()
+        )
+        for name, birth_date, sex, patient_id in rows:
+            found[(name, birth_date, sex)] = patient_id
+    
+    return [
+        {"is_duplicate": key in found, "patient_id": found.get(key)}
+        for key in keys
+    ]
 
 
 # 환자 생성 (기본 정보만)
@@ -303,35 +317,34 @@ def create_patient(patient: PatientCreate, db: Session = Depends(get_db)):
     """
     새로운 환자를 생성합니다 (기본 정보만).
     """
-    try:
-        # 중복 환자 체크
-        existing_patient = db.query(Patient).filter(
-            Patient.name == patient.name,
-            Patient.sex == patient.sex,
-            Patient.birth_date == patient.birth_date
-        ).first()
-        
-        if existing_patient:
-            raise HTTPException(status_code=400, detail="이미 존재하는 환자입니다")
-        
-        # 환자 기본정보 생성
-        db_patient = Patient(
-            name=patient.name,
-            sex=patient.sex,
-            birth_date=patient.birth_date
+    # 중복 환자가 없을 때만 INSERT하는 단일 문장 (조회와 삽입 사이의 경쟁 상태 없음)
+    # 다른 등록 경로는 동일 환자 재등록을 허용하므로 UNIQUE 제약 대신 NOT EXISTS 사용
+    duplicate = exists().where(
+        Patient.name == patient.name,
+        Patient.sex == patient.sex,
+        Patient.birth_date == patient.birth_date
+    )
+    stmt = (
+        insert(Patient)
+        .from_select(
+            ["name", "sex", "birth_date", "created_at"],
+            select(
+                literal(patient.name),
+                literal(patient.sex),
+                literal(patient.birth_date),
+                literal(datetime.utcnow(), DateTime)
+            ).where(~duplicate)
         )
-        
-        db.add(db_patient)
-        db.commit()
-        db.refresh(db_patient)
-        
-        return db_patient
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"환자 생성 실패: {str(e)}")
+        .returning(Patient.id, Patient.name, Patient.sex, Patient.birth_date, Patient.created_at)
+    )
+    db_patient = db.execute(stmt).mappings().first()
+    
+    if db_patient is None:
+        raise HTTPException(status_code=400, detail="이미 존재하는 환자입니다")
+    
+    db.commit()
+    
+    return db_patient
 
 
 # 주민등록번호로 환자 생성
@@ -340,14 +353,13 @@ def create_patient_with_resident(patient: PatientCreateWithResident, db: Session
     """
     주민등록번호로부터 환자 정보를 생성합니다.
     """
-    try:
-        return create_patient_from_resident_number(db, patient.name, patient.resident_number)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"환자 생성 실패: {str(e)}")
+    # flush만 하고 응답을 만든 뒤 커밋 (커밋 후 만료된 속성을 다시 조회하는 SELECT 생략)
+    db_patient = create_patient_from_resident_number(
+        db, patient.name, patient.resident_number, flush_only=True
+    )
+    response = PatientResponse.model_validate(db_patient)
+    db.commit()
+    return response
 
 
 # 본인인증 완료 후 환자 정보와 검사수치를 함께 생성
@@ -356,131 +368,122 @@ def create_patient_with_measurement(patient_data: PatientCreateWithMeasurement,
     """
     본인인증 완료 후 환자 정보와 검사수치를 함께 생성합니다.
     """
+    # 1. 주민등록번호로 환자 생성
     try:
-        # 1. 주민등록번호로 환자 생성
-        try:
-            # 새 환자 생성 (기존 환자 검색 없이)
-            db_patient = create_patient_from_resident_number(db, patient_data.name, patient_data.resident_number)
-            print(f"👤 새 환자 생성: ID={db_patient.id}, 이름={db_patient.name}")
-                
-        except HTTPException as e:
-            raise HTTPException(status_code=400, detail=f"환자 생성 실패: {e.detail}")
-        
-        # 2. 검사수치 생성
-        db_measurement = PatientMeasurement(
-            patient_id=db_patient.id,
-            weight_kg=patient_data.measurement.weight_kg,
-            height_cm=patient_data.measurement.height_cm,
-            scr_mg_dl=patient_data.measurement.scr_mg_dl,
-            egfr=patient_data.measurement.egfr,
-            crcl=patient_data.measurement.crcl,
-            crcl_normalized=patient_data.measurement.crcl_normalized,
-            bsa=patient_data.measurement.bsa,
-            is_hd=patient_data.measurement.is_hd
+        # 새 환자 생성 (기존 환자 검색 없이)
+        db_patient = create_patient_from_resident_number(
+            db, patient_data.name, patient_data.resident_number, flush_only=True
         )
-        
-        db.add(db_measurement)
-        db.commit()
-        db.refresh(db_measurement)
-        
-        return PatientCreateResponse(
-            patient=db_patient,
-            measurement=db_measurement,
-            message="환자 정보와 검사수치가 성공적으로 등록되었습니다"
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"환자 및 검사수치 등록 실패: {str(e)}")
+        logger.debug("새 환자 생성: ID=%s, 이름=%s", db_patient.id, db_patient.name)
+            
+    except HTTPException as e:
+        raise HTTPException(status_code=400, detail=f"환자 생성 실패: {e.detail}")
+    
+    # 2. 검사수치 생성
+    db_measurement = PatientMeasurement(
+        patient_id=db_patient.id,
+        weight_kg=patient_data.measurement.weight_kg,
+        height_cm=patient_data.measurement.height_cm,
+        scr_mg_dl=patient_data.measurement.scr_mg_dl,
+        egfr=patient_data.measurement.egfr,
+        crcl=patient_data.measurement.crcl,
+        crcl_normalized=patient_data.measurement.crcl_normalized,
+        bsa=patient_data.measurement.bsa,
+        is_hd=patient_data.measurement.is_hd
+    )
+    
+    db.add(db_measurement)
+    db.commit()
+    db.refresh(db_measurement)
+    
+    return PatientCreateResponse(
+        patient=db_patient,
+        measurement=db_measurement,
+        message="환자 정보와 검사수치가 성공적으로 등록되었습니다"
+    )
 
 
 # 환자 정보와 검사수치를 함께 생성 (NewAudit용)
 @router.post("/with-measurement-direct", response_model=PatientCreateResponse)
 def create_patient_with_measurement_direct(
-    patient_data: dict, 
+    patient_data: PatientCreateDirect, 
     db: Session = Depends(get_db)
 ):
     """
     NewAudit에서 사용하는 환자 정보와 검사수치를 함께 생성합니다.
     주민등록번호 없이도 작동합니다.
     """
-    try:
-        # 1. 환자 기본정보 생성
-        db_patient = Patient(
-            name=patient_data.get('name') or "Unknown",
-            sex=patient_data.get('sex'),
-            birth_date=patient_data.get('birth_date')
-        )
-        
-        db.add(db_patient)
-        db.commit()
-        db.refresh(db_patient)
-        
-        print(f"👤 새 환자 생성: ID={db_patient.id}, 이름={db_patient.name}")
-        
-        # 2. 검사수치 생성
-        db_measurement = PatientMeasurement(
-            patient_id=db_patient.id,
-            weight_kg=patient_data.get('weight_kg', 0),
-            height_cm=patient_data.get('height_cm', 0),
-            scr_mg_dl=patient_data.get('scr_mg_dl', 0),
-            egfr=patient_data.get('egfr', 0),
-            crcl=patient_data.get('crcl', 0),
-            crcl_normalized=patient_data.get('crcl_normalized', 0),
-            bsa=patient_data.get('bsa', 0),
-            is_hd=patient_data.get('is_hd', False)
-        )
-        
-        db.add(db_measurement)
-        db.commit()
-        db.refresh(db_measurement)
-        
-        return PatientCreateResponse(
-            patient=db_patient,
-            measurement=db_measurement,
-            message="환자 정보와 검사수치가 성공적으로 등록되었습니다"
-        )
-        
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"환자 및 검사수치 등록 실패: {str(e)}")
+    # 1. 환자 기본정보 생성
+    db_patient = Patient(
+        name=patient_data.name or "Unknown",
+        sex=patient_data.sex,
+        birth_date=patient_data.birth_date
+    )
+    
+    db.add(db_patient)
+    db.flush()  # 커밋 없이 patient.id 확보
+    
+    logger.debug("새 환자 생성: ID=%s, 이름=%s", db_patient.id, db_patient.name)
+    
+    # 2. 검사수치 생성
+    db_measurement = PatientMeasurement(
+        patient_id=db_patient.id,
+        weight_kg=patient_data.weight_kg,
+        height_cm=patient_data.height_cm,
+        scr_mg_dl=patient_data.scr_mg_dl,
+        egfr=patient_data.egfr,
+        crcl=patient_data.crcl,
+        crcl_normalized=patient_data.crcl_normalized,
+        bsa=patient_data.bsa,
+        is_hd=patient_data.is_hd
+    )
+    
+    db.add(db_measurement)
+    db.commit()
+    db.refresh(db_measurement)
+    
+    return PatientCreateResponse(
+        patient=db_patient,
+        measurement=db_measurement,
+        message="환자 정보와 검사수치가 성공적으로 등록되었습니다"
+    )
 
 
 # 특정 환자 정보 조회
 @router.get("/{patient_id}", response_model=PatientInfoResponse)
-def get_patient_info(patient_id: int, db: Session = Depends(get_db)):
+def get_patient_info(patient_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     환자의 기본정보와 최신 검사수치를 조회합니다.
+    If-None-Match가 현재 ETag와 같으면 본문 없이 304를 반환합니다.
     """
-    try:
-        # 환자 기본정보 조회
-        patient = db.query(Patient).filter(Patient.id == patient_id).first()
-        if not patient:
-            raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
-        
-        # 최신 검사수치 조회
-        latest_measurement = (
-            db.query(PatientMeasurement)
-            .filter(PatientMeasurement.patient_id == patient_id)
-            .order_by(PatientMeasurement.measured_at.desc())
-            .first()
-        )
-        
-        return PatientInfoResponse(
-            id=patient.id,
-            name=patient.name,
-            sex=patient.sex,
-            birth_date=patient.birth_date,
-            created_at=patient.created_at,
-            latest_measurement=latest_measurement
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"환자 정보 조회 실패: {str(e)}")
+    # 환자 정보는 수정 API가 없으므로 검사수치의 추가/삭제만 버전에 반영
+    version = (
+        db.query(Patient.created_at, func.max(PatientMeasurement.id), func.count(PatientMeasurement.id))
+        .outerjoin(PatientMeasurement, PatientMeasurement.patient_id == Patient.id)
+        .filter(Patient.id == patient_id)
+        .group_by(Patient.id)
+        .one_or_none()
+    )
+    if version is None:
+        raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
+    
+    etag = _weak_etag(patient_id, *version)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # 환자 기본정보와 최신 검사수치 조회 (lambda_stmt로 캐시된 문장 재사용)
+    stmt = lambda_stmt(
+        lambda: select(Patient)
+        .options(selectinload(Patient.latest_measurement))
+        .where(Patient.id == patient_id)
+    )
+    patient = db.execute(stmt).scalars().first()
+    if not patient:
+        raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
+    
+    return patient
 
 
 # 환자 검사수치 추가
@@ -493,36 +496,28 @@ def add_patient_measurement(
     """
     환자의 검사수치를 추가합니다.
     """
-    try:
-        # 환자 존재 확인
-        patient = db.query(Patient).filter(Patient.id == patient_id).first()
-        if not patient:
-            raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
-        
-        # 검사수치 생성
-        db_measurement = PatientMeasurement(
-            patient_id=patient_id,
-            weight_kg=measurement.weight_kg,
-            height_cm=measurement.height_cm,
-            scr_mg_dl=measurement.scr_mg_dl,
-            egfr=measurement.egfr,
-            crcl=measurement.crcl,
-            crcl_normalized=measurement.crcl_normalized,
-            bsa=measurement.bsa,
-            is_hd=measurement.is_hd
-        )
-        
-        db.add(db_measurement)
-        db.commit()
-        db.refresh(db_measurement)
-        
-        return db_measurement
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"검사수치 추가 실패: {str(e)}")
+    # 환자 존재 확인
+    if not _patient_exists(db, patient_id):
+        raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
+    
+    # 검사수치 생성
+    db_measurement = PatientMeasurement(
+        patient_id=patient_id,
+        weight_kg=measurement.weight_kg,
+        height_cm=measurement.height_cm,
+        scr_mg_dl=measurement.scr_mg_dl,
+        egfr=measurement.egfr,
+        crcl=measurement.crcl,
+        crcl_normalized=measurement.crcl_normalized,
+        bsa=measurement.bsa,
+        is_hd=measurement.is_hd
+    )
+    
+    db.add(db_measurement)
+    db.commit()
+    db.refresh(db_measurement)
+    
+    return db_measurement
 
 
 # 환자 검사수치 이력 조회
@@ -536,27 +531,21 @@ def get_patient_measurements(
     특정 환자의 검사수치 이력을 조회합니다.
     최신 순으로 정렬됩니다.
     """
-    try:
-        # 환자 존재 확인
-        patient = db.query(Patient).filter(Patient.id == patient_id).first()
-        if not patient:
-            raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
-        
-        # 검사수치 이력 조회
-        measurements = (
-            db.query(PatientMeasurement)
-            .filter(PatientMeasurement.patient_id == patient_id)
-            .order_by(PatientMeasurement.measured_at.desc())
-            .limit(limit)
-            .all()
-        )
-        
-        return measurements
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"검사수치 조회 실패: {str(e)}")
+    # 환자 존재 확인
+    if not _patient_exists(db, patient_id):
+        raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
+    
+    # 검사수치 이력 조회 (관계 지연 로딩 금지)
+    measurements = (
+        db.query(PatientMeasurement)
+        .options(raiseload("*"))
+        .filter(PatientMeasurement.patient_id == patient_id)
+        .order_by(PatientMeasurement.measured_at.desc())
+        .limit(limit)
+        .all()
+    )
+    
+    return measurements
 
 
 # 환자 검사수치 추이 조회
@@ -570,86 +559,68 @@ def get_measurement_trend(
     """
     특정 환자의 검사수치 변화 추이를 조회합니다.
     """
-    try:
-        # 환자 존재 확인
-        patient = db.query(Patient).filter(Patient.id == patient_id).first()
-        if not patient:
-            raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
-        
-        # 유효한 파라미터 확인
-        valid_parameters = [
-            'weight_kg', 'height_cm', 'scr_mg_dl', 'egfr', 
-            'crcl', 'crcl_normalized', 'bsa'
-        ]
-        
-        if parameter not in valid_parameters:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"잘못된 파라미터입니다. 사용 가능한 파라미터: {', '.join(valid_parameters)}"
-            )
-        
-        # 검사수치 이력 조회
-        measurements = (
-            db.query(PatientMeasurement)
-            .filter(PatientMeasurement.patient_id == patient_id)
-            .order_by(PatientMeasurement.measured_at.desc())
-            .limit(limit)
-            .all()
+    # 환자 존재 확인
+    patient_row = db.query(Patient.name).filter(Patient.id == patient_id).first()
+    if patient_row is None:
+        raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
+    
+    # 유효한 파라미터 확인
+    column = TREND_COLUMNS.get(parameter)
+    if column is None:
+        raise HTTPException(status_code=400, detail=_INVALID_TREND_PARAMETER_DETAIL)
+    
+    # 최근 limit개만 잘라낸 뒤 시간순(오래된 것부터)으로 정렬 - 필요한 컬럼만 조회
+    recent = (
+        select(
+            PatientMeasurement.id,
+            PatientMeasurement.measured_at,
+            column.label("value"),
         )
-        
-        # 추이 데이터 구성
-        trend_data = []
-        for measurement in measurements:
-            value = getattr(measurement, parameter)
-            trend_data.append({
-                "measured_at": measurement.measured_at,
-                "value": value,
-                "measurement_id": measurement.id
-            })
-        
-        # 시간순으로 정렬 (오래된 것부터)
-        trend_data.reverse()
-        
-        return {
-            "patient_id": patient_id,
-            "patient_name": patient.name,
-            "parameter": parameter,
-            "trend_data": trend_data
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"추이 조회 실패: {str(e)}") 
+        .where(PatientMeasurement.patient_id == patient_id)
+        .order_by(PatientMeasurement.measured_at.desc())
+        .limit(limit)
+        .subquery()
+    )
+    rows = db.execute(
+        select(recent.c.id, recent.c.measured_at, recent.c.value)
+        .order_by(recent.c.measured_at.asc())
+    ).all()
+    
+    # 추이 데이터 구성
+    trend_data = [
+        {"measured_at": measured_at, "value": value, "measurement_id": measurement_id}
+        for measurement_id, measured_at, value in rows
+    ]
+    
+    return {
+        "patient_id": patient_id,
+        "patient_name": patient_row.name,
+        "parameter": parameter,
+        "trend_data": trend_data
+    }
 
 @router.get("/{patient_id}/measurements/latest", response_model=PatientMeasurementResponse)
 def get_latest_measurement(patient_id: int, db: Session = Depends(get_db)):
     """
     환자의 최신 검사기록을 조회합니다.
     """
-    try:
-        # 환자 존재 확인
-        patient = db.query(Patient).filter(Patient.id == patient_id).first()
-        if not patient:
-            raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
-        
-        # 최신 검사수치 조회
-        latest_measurement = (
-            db.query(PatientMeasurement)
-            .filter(PatientMeasurement.patient_id == patient_id)
-            .order_by(PatientMeasurement.measured_at.desc())
-            .first()
+    # 환자 존재 확인
+    if not _patient_exists(db, patient_id):
+        raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
+    
+    # 최신 검사수치 조회 (lambda_stmt로 캐시된 문장 재사용)
+    stmt = lambda_stmt(
+        lambda: select(PatientMeasurement)
+        .where(PatientMeasurement.patient_id == patient_id)
+        .order_by(PatientMeasurement.measured_at.desc())
+        .limit(1)
+    )
+    latest_measurement = db.execute(stmt).scalars().first()
+    
+    if not latest_measurement:
+        raise HTTPException(
+            status_code=404, 
+            detail="환자의 검사기록이 없습니다"
         )
-        
-        if not latest_measurement:
-            raise HTTPException(
-                status_code=404, 
-                detail="환자의 검사기록이 없습니다"
-            )
-        
-        return latest_measurement
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"검사기록 조회 실패: {str(e)}") 
\ No newline at end of file
+    
+    return latest_measurement
\ No newline at end of file
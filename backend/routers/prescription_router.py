@@ -1,22 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.orm import Session, contains_eager, raiseload
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from models.database import get_db
 from models.prescription import Prescription
 from models.prescription_order import PrescriptionOrder
 from models.patient import Patient
 from models.patient_measurement import PatientMeasurement
-from services.prescription_audit_service import get_audit_service
+from services.prescription_audit_service import NOT_AUDITED, get_audit_service
 from utils.resident_number import find_patient_by_resident_number
+from utils.ttl_cache import TTLCache
 
 # 처방 관련 API 라우터
 router = APIRouter(prefix="/api/prescriptions", tags=["prescriptions"])
 
-# 환자 정보 캐시 (메모리 최적화)
-_patient_cache = {}
+logger = logging.getLogger(__name__)
+
+# 환자 정보 캐시 (크기를 제한하고, 새 검사수치가 반영되도록 일정 시간 후 만료)
+# order_id -> patient_id, patient_id -> 최신 검사수치 기반 감사용 데이터
+# 환자 단위로 저장하므로 같은 환자의 여러 주문이 캐시를 공유
+PATIENT_CACHE_SIZE = 4096
+PATIENT_CACHE_TTL_SECONDS = 60
+_order_patient_cache = TTLCache(maxsize=PATIENT_CACHE_SIZE, ttl=PATIENT_CACHE_TTL_SECONDS)
+_patient_cache = TTLCache(maxsize=PATIENT_CACHE_SIZE, ttl=PATIENT_CACHE_TTL_SECONDS)
 
 
 class PrescriptionOrderCreate(BaseModel):
@@ -43,7 +55,16 @@ class PrescriptionCreate(BaseModel):
     duration_days: int = Field(1, description="투여 기간")
 
 
-class PrescriptionOrderResponse(BaseModel):
+class TrustedResponseModel(BaseModel):
+    """DB에서 읽은 값으로 만드는 응답 모델 (조회 경로에서는 필드 검증 생략)"""
+
+    @classmethod
+    def from_orm_trusted(cls, obj):
+        """쓰기 시 이미 검증된 DB 행/ORM 객체로 검증 없이 응답 모델을 생성합니다."""
+        return cls.model_construct(**{field: getattr(obj, field) for field in cls.model_fields})
+
+
+class PrescriptionOrderResponse(TrustedResponseModel):
     """처방 주문 응답"""
     id: int
     patient_id: int
@@ -51,11 +72,10 @@ class PrescriptionOrderResponse(BaseModel):
     submitted_at: datetime
     note: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class PrescriptionResponse(BaseModel):
+class PrescriptionResponse(TrustedResponseModel):
     """처방 응답"""
     id: int
     order_id: int
@@ -71,8 +91,11 @@ class PrescriptionResponse(BaseModel):
     information: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# 목록 조회 시 한 페이지 최대 개수
+MAX_PAGE_SIZE = 500
 
 
 class PrescriptionInputRequest(BaseModel):
@@ -110,64 +133,192 @@ class PrescriptionInputWithPatientIdRequest(BaseModel):
     medications: List[PrescriptionInputMedication] = Field(..., description="처방 약물 목록")
 
 
+# 감사에 필요한 검사수치 컬럼
+_AUDIT_MEASUREMENT_COLUMNS = (
+    PatientMeasurement.weight_kg,
+    PatientMeasurement.bsa,
+    PatientMeasurement.crcl,
+    PatientMeasurement.crcl_normalized,
+    PatientMeasurement.egfr,
+    PatientMeasurement.scr_mg_dl,
+    PatientMeasurement.is_hd,
+)
+
+
+# 환자의 최신 검사수치(감사용 컬럼) 조회 문장 - 모듈 로드 시 한 번만 구성하고 컴파일 캐시를 재사용
+_LATEST_MEASUREMENT_STMT = (
+    select(PatientMeasurement.patient_id, *_AUDIT_MEASUREMENT_COLUMNS)
+    .where(PatientMeasurement.patient_id == bindparam("pid"))
+    .order_by(PatientMeasurement.measured_at.desc(), PatientMeasurement.id.desc())
+    .limit(1)
+)
+
+
+def _latest_measurement(db: Session, patient_id: int):
+    """환자의 최신 검사수치 행을 반환합니다. 없으면 None을 반환합니다."""
+    return db.execute(_LATEST_MEASUREMENT_STMT, {"pid": patient_id}).first()
+
+
+def _cached_patient_data_for_order(order_id: int) -> Optional[dict]:
+    """주문의 환자 ID와 환자 정보가 모두 캐시에 있으면 환자 정보를 반환합니다."""
+    patient_id = _order_patient_cache.get(order_id)
+    if patient_id is None:
+        return None
+    return _patient_cache.get(patient_id)
+
+
+def _cache_patient_data(order_id: int, patient_id: int, patient_data: dict):
+    """주문 -> 환자, 환자 -> 환자 정보 캐시를 함께 채웁니다."""
+    _order_patient_cache.set(order_id, patient_id)
+    _patient_cache.set(patient_id, patient_data)
+
+
+def _to_patient_data(measurement) -> dict:
+    """검사수치 행을 감사 서비스가 사용하는 환자 정보 딕셔너리로 변환합니다."""
+    return {
+        "weight_kg": measurement.weight_kg,
+        "bsa": measurement.bsa,
+        "crcl": measurement.crcl,
+        "crcl_normalization": measurement.crcl_normalized,
+        "egfr": measurement.egfr,
+        "scr_mg_dl": measurement.scr_mg_dl,
+        "is_hd": measurement.is_hd
+    }
+
+
 def get_patient_data_cached(order_id: int, db: Session) -> Optional[dict]:
     """환자 정보를 캐싱하여 반복 조회를 방지합니다."""
-    if order_id in _patient_cache:
-        return _patient_cache[order_id]
-    
-    patient = db.query(Patient).join(PrescriptionOrder).filter(
-        PrescriptionOrder.id == order_id
-    ).first()
-    
-    if patient:
-        # 환자의 최신 검사 수치 조회
+    patient_id = _order_patient_cache.get(order_id)
+    if patient_id is not None:
+        patient_data = _patient_cache.get(patient_id)
+        if patient_data is not None:
+            return patient_data
+        
+        # 주문의 환자를 이미 알고 있으면 주문 테이블 JOIN 없이 최신 검사수치만 조회
+        latest_measurement = _latest_measurement(db, patient_id)
+    else:
+        # 주문 -> 환자 -> 최신 검사수치를 한 번의 쿼리로 조회 (감사에 필요한 컬럼만)
         latest_measurement = (
-            db.query(PatientMeasurement)
-            .filter(PatientMeasurement.patient_id == patient.id)
-            .order_by(PatientMeasurement.measured_at.desc())
+            db.query(PatientMeasurement.patient_id, *_AUDIT_MEASUREMENT_COLUMNS)
+            .join(PrescriptionOrder, PrescriptionOrder.patient_id == PatientMeasurement.patient_id)
+            .filter(PrescriptionOrder.id == order_id)
+            .order_by(PatientMeasurement.measured_at.desc(), PatientMeasurement.id.desc())
             .first()
         )
-        
-        if latest_measurement:
-            patient_data = {
-                "weight_kg": latest_measurement.weight_kg,
-                "bsa": latest_measurement.bsa,
-                "crcl": latest_measurement.crcl,
-                "crcl_normalization": latest_measurement.crcl_normalized,
-                "egfr": latest_measurement.egfr,
-                "scr_mg_dl": latest_measurement.scr_mg_dl,
-                "is_hd": latest_measurement.is_hd
-            }
-            _patient_cache[order_id] = patient_data
-            return patient_data
+    
+    if latest_measurement:
+        patient_data = _to_patient_data(latest_measurement)
+        _cache_patient_data(order_id, latest_measurement.patient_id, patient_data)
+        return patient_data
     
     return None
 
 
-def update_prescription_order_note(db: Session, order_id: int):
-    """처방 주문의 note를 감사 결과에 따라 업데이트합니다."""
-    try:
-        # 해당 주문의 모든 처방들 조회
-        prescriptions = db.query(Prescription).filter(Prescription.order_id == order_id).all()
-        
-        if not prescriptions:
-            return
-        
-        # 모든 처방의 audit_result가 "-"인지 확인
-        all_normal = all(prescription.audit_result == "-" for prescription in prescriptions)
-        
-        # 감사 결과에 따른 상태 결정
-        audit_status = "정상" if all_normal else "이상"
-        
-        # prescription_order의 note 업데이트
-        order = db.query(PrescriptionOrder).filter(PrescriptionOrder.id == order_id).first()
-        if order:
-            order.note = audit_status
-            db.commit()
-            
-    except Exception as e:
-        print(f"❌ 처방 주문 note 업데이트 중 오류: {e}")
-        db.rollback()
+def get_patient_data_cached_many(order_ids: List[int], db: Session) -> dict:
+    """
+    여러 주문의 환자 정보를 조회합니다. 캐시에 없는 주문은 한 번의 쿼리로 함께 조회합니다.
+    
+    Returns:
+        주문 ID -> 환자 정보 (검사수치가 없는 주문은 제외)
+    """
+    result = {}
+    missing_order_ids = []
+    for order_id in order_ids:
+        patient_data = _cached_patient_data_for_order(order_id)
+        if patient_data is not None:
+            result[order_id] = patient_data
+        else:
+            missing_order_ids.append(order_id)
+    
+    if missing_order_ids:
+        # 주문별 최신 검사수치 1건 (ROW_NUMBER 윈도 함수로 rn=1만 선택)
+        ranked = (
+            select(
+                PrescriptionOrder.id.label("order_id"),
+                PatientMeasurement.patient_id,
+                *_AUDIT_MEASUREMENT_COLUMNS,
+                func.row_number().over(
+                    partition_by=PrescriptionOrder.id,
+                    order_by=(PatientMeasurement.measured_at.desc(), PatientMeasurement.id.desc())
+                ).label("rn")
+            )
+            .join(PatientMeasurement, PatientMeasurement.patient_id == PrescriptionOrder.patient_id)
+            .where(PrescriptionOrder.id.in_(missing_order_ids))
+            .subquery()
+        )
+        for row in db.execute(select(ranked).where(ranked.c.rn == 1)):
+            patient_data = _to_patient_data(row)
+            _cache_patient_data(row.order_id, row.patient_id, patient_data)
+            result[row.order_id] = patient_data
+    
+    return result
+
+
+def ensure_orders_exist(db: Session, order_ids: List[int]):
+    """처방 주문이 모두 존재하는지 확인하고, 없는 주문이 있으면 404를 발생시킵니다."""
+    found = set(db.scalars(select(PrescriptionOrder.id).where(PrescriptionOrder.id.in_(order_ids))))
+    if len(found) < len(set(order_ids)):
+        raise HTTPException(status_code=404, detail="처방 주문을 찾을 수 없습니다")
+
+
+def insert_prescription_rows(db: Session, rows: List[dict]) -> List[dict]:
+    """처방 행들을 한 번의 INSERT ... RETURNING으로 저장하고 저장된 행을 입력 순서대로 반환합니다."""
+    if not rows:
+        return []
+    
+    table = Prescription.__table__
+    stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+    return [dict(row) for row in db.execute(stmt, rows).mappings()]
+
+
+def order_note_from_audit_results(audit_results: List[str]) -> Optional[str]:
+    """주문의 전체 처방 감사 결과로 note를 결정합니다 (처방이 없으면 None)."""
+    if not audit_results:
+        return None
+    return "정상" if all(result == "-" for result in audit_results) else "이상"
+
+
+def update_prescription_order_note(db: Session, order_id: int) -> Optional[str]:
+    """
+    처방 주문의 note를 감사 결과에 따라 업데이트하고 설정된 note를 반환합니다 (커밋은 호출자가 수행).
+    """
+    return update_prescription_order_notes(db, [order_id]).get(order_id)
+
+
+def update_prescription_order_notes(db: Session, order_ids: List[int]) -> dict:
+    """
+    여러 처방 주문의 note를 한 번의 집계 쿼리와 한 번의 UPDATE로 갱신합니다.
+    호출자의 트랜잭션 안에서 실행되며 커밋은 호출자가 수행합니다.
+    
+    Returns:
+        주문 ID -> 설정된 note (처방이 없는 주문은 제외)
+    """
+    # 처방 행을 가져오지 않고 주문별 "-"가 아닌 감사 결과 개수만 집계 (처방이 없는 주문은 제외)
+    rows = (
+        db.query(
+            Prescription.order_id,
+            func.count(Prescription.id).filter(Prescription.audit_result != "-")
+        )
+        .filter(Prescription.order_id.in_(order_ids))
+        .group_by(Prescription.order_id)
+        .all()
+    )
+    if not rows:
+        return {}
+    
+    # 감사 결과에 따른 상태 결정 후 주문별 note 일괄 업데이트
+    notes = {
+        order_id: "정상" if abnormal_count == 0 else "이상"
+        for order_id, abnormal_count in rows
+    }
+    orders = PrescriptionOrder.__table__
+    db.execute(
+        update(orders)
+        .where(orders.c.id == bindparam("target_id"))
+        .values(note=bindparam("audit_status")),
+        [{"target_id": order_id, "audit_status": note} for order_id, note in notes.items()]
+    )
+    return notes
 
 
 @router.post("/orders", response_model=PrescriptionOrderResponse)
@@ -187,12 +338,10 @@ def create_prescription_order(order: PrescriptionOrderCreate, db: Session = Depe
         
         # 환자 이름 확인 (선택적)
         if order.patient_name and patient.name != order.patient_name:
-            print(f"⚠️  환자 이름 불일치: 입력={order.patient_name}, DB={patient.name}")
+            logger.warning("환자 이름 불일치: 입력=%s, DB=%s", order.patient_name, patient.name)
         
         # 최신 검사수치 확인
-        latest_measurement = db.query(PatientMeasurement).filter(
-            PatientMeasurement.patient_id == patient.id
-        ).order_by(PatientMeasurement.measured_at.desc()).first()
+        latest_measurement = _latest_measurement(db, patient.id)
         
         if not latest_measurement:
             raise HTTPException(
@@ -209,16 +358,19 @@ def create_prescription_order(order: PrescriptionOrderCreate, db: Session = Depe
         )
         
         db.add(db_order)
-        db.commit()
-        db.refresh(db_order)
+        db.flush()
         
-        return PrescriptionOrderResponse(
+        # 커밋 후 만료된 객체를 다시 읽지 않도록 응답 값을 먼저 구성
+        response = PrescriptionOrderResponse(
             id=db_order.id,
             patient_id=patient.id,
             patient_name=patient.name,
-            submitted_at=db_order.submitted_at,
-            note=db_order.note
+            submitted_at=current_time,
+            note=None
         )
+        db.commit()
+        
+        return response
         
     except HTTPException:
         raise
@@ -239,9 +391,7 @@ def create_prescription_order_with_patient_id(order: PrescriptionOrderCreateWith
             raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다")
         
         # 최신 검사수치 확인
-        latest_measurement = db.query(PatientMeasurement).filter(
-            PatientMeasurement.patient_id == patient.id
-        ).order_by(PatientMeasurement.measured_at.desc()).first()
+        latest_measurement = _latest_measurement(db, patient.id)
         
         if not latest_measurement:
             raise HTTPException(
@@ -258,16 +408,19 @@ def create_prescription_order_with_patient_id(order: PrescriptionOrderCreateWith
         )
         
         db.add(db_order)
-        db.commit()
-        db.refresh(db_order)
+        db.flush()
         
-        return PrescriptionOrderResponse(
+        # 커밋 후 만료된 객체를 다시 읽지 않도록 응답 값을 먼저 구성
+        response = PrescriptionOrderResponse(
             id=db_order.id,
             patient_id=patient.id,
             patient_name=patient.name,
-            submitted_at=db_order.submitted_at,
-            note=db_order.note
+            submitted_at=current_time,
+            note=None
         )
+        db.commit()
+        
+        return response
         
     except HTTPException:
         raise
@@ -282,6 +435,9 @@ def create_prescription(prescription: PrescriptionCreate, db: Session = Depends(
     새로운 처방을 생성하고 즉시 감사를 수행합니다.
     """
     try:
+        # 0. 처방 주문 존재 확인 (외래키 오류 대신 404 응답)
+        ensure_orders_exist(db, [prescription.order_id])
+        
         # 1. 처방 데이터 생성 (임시 감사 결과로 시작)
         db_prescription = Prescription(
             order_id=prescription.order_id,
@@ -297,11 +453,11 @@ def create_prescription(prescription: PrescriptionCreate, db: Session = Depends(
             information="적정 용량입니다."  # 기본값
         )
         
-        # 2. 환자 정보 조회 (캐싱 적용)
-        patient_data = get_patient_data_cached(prescription.order_id, db)
+        # 2. 환자 정보 조회 (캐싱 적용, 약물 ID가 없으면 감사하지 않으므로 조회 생략)
+        patient_data = get_patient_data_cached(prescription.order_id, db) if prescription.drug_id else None
         
         # 3. 감사 실행 (DB 저장 전에 완료)
-        if patient_data and prescription.drug_id:
+        if patient_data:
             try:
                 audit_service = get_audit_service()
                 
@@ -327,16 +483,16 @@ def create_prescription(prescription: PrescriptionCreate, db: Session = Depends(
                 db_prescription.audit_result = "-"
                 db_prescription.information = f"감사 오류: {str(audit_error)}"
         
-        # 4. DB 저장
+        # 4. DB 저장 및 처방 주문 상태 업데이트 (한 트랜잭션으로 커밋)
         db.add(db_prescription)
-        db.commit()
-        db.refresh(db_prescription)
-        
-        # 5. 처방 주문 상태 업데이트
+        db.flush()
         update_prescription_order_note(db, prescription.order_id)
+        db.commit()
         
         return db_prescription
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"처방 생성 실패: {str(e)}")
@@ -351,14 +507,11 @@ def create_prescriptions_batch(prescriptions: List[PrescriptionCreate], db: Sess
         if not prescriptions:
             return []
         
-        # 1. 환자 정보 미리 조회 (배치 최적화)
+        # 1. 환자 정보 미리 조회 (배치 최적화, 감사할 약물이 있는 주문만)
         order_ids = list(set(p.order_id for p in prescriptions))
-        patient_data_cache = {}
-        
-        for order_id in order_ids:
-            patient_data = get_patient_data_cached(order_id, db)
-            if patient_data:
-                patient_data_cache[order_id] = patient_data
+        ensure_orders_exist(db, order_ids)  # 외래키 오류 대신 404 응답
+        audited_order_ids = list(set(p.order_id for p in prescriptions if p.drug_id))
+        patient_data_cache = get_patient_data_cached_many(audited_order_ids, db) if audited_order_ids else {}
         
         # 2. 감사 서비스 한 번만 초기화
         audit_service = get_audit_service()
@@ -372,86 +525,103 @@ def create_prescriptions_batch(prescriptions: List[PrescriptionCreate], db: Sess
             order_groups[order_id].append(prescription)
         
         # 4. 모든 처방 생성 및 배치 감사
-        db_prescriptions = []
+        prescription_rows = []
         
         for order_id, order_prescriptions in order_groups.items():
             patient_data = patient_data_cache.get(order_id)
             
-            # 배치 감사를 위한 처방 데이터 준비
-            prescriptions_data = []
-            for prescription in order_prescriptions:
-                prescriptions_data.append({
-                    "drug_id": prescription.drug_id,
-                    "dose_amount": prescription.dose_amount,
-                    "real_amount": prescription.real_amount,
-                    "doses_per_day": prescription.doses_per_day
-                })
-            
-            # 배치 감사 실행
-            audit_results = []
+            # 약물 ID가 있는 처방만 감사 대상으로 분리 (나머지는 기본값으로 저장)
+            audit_results_by_index = {}
             if patient_data:
-                try:
-                    audit_results = audit_service.audit_prescriptions_batch(
-                        patient_data, prescriptions_data
-                    )
-                except Exception:
-                    audit_results = [{"audit_result": "-", "information": ""}] * len(prescriptions_data)
-            else:
-                audit_results = [{"audit_result": "-", "information": ""}] * len(prescriptions_data)
+                auditable_indexes = [i for i, p in enumerate(order_prescriptions) if p.drug_id]
+                prescriptions_data = [
+                    {
+                        "drug_id": order_prescriptions[i].drug_id,
+                        "dose_amount": order_prescriptions[i].dose_amount,
+                        "real_amount": order_prescriptions[i].real_amount,
+                        "doses_per_day": order_prescriptions[i].doses_per_day
+                    }
+                    for i in auditable_indexes
+                ]
+                
+                # 배치 감사 실행
+                if prescriptions_data:
+                    try:
+                        audit_results = audit_service.audit_prescriptions_batch(
+                            patient_data, prescriptions_data
+                        )
+                        audit_results_by_index = dict(zip(auditable_indexes, audit_results))
+                    except Exception:
+                        # 감사 실패시 기본값 유지
+                        audit_results_by_index = {}
             
-            # 처방 객체 생성 및 감사 결과 적용
+            # 처방 행 생성 및 감사 결과 적용
             for i, prescription in enumerate(order_prescriptions):
-                audit_result_data = audit_results[i] if i < len(audit_results) else {"audit_result": "-", "information": ""}
-                audit_result = audit_result_data.get("audit_result", "-")
-                information = audit_result_data.get("information", "")
-                
-                db_prescription = Prescription(
-                    order_id=prescription.order_id,
-                    drug_id=prescription.drug_id,
-                    drug_korean_name=prescription.drug_korean_name,
-                    drug_ingredient=prescription.drug_ingredient,
-                    dose_amount=prescription.dose_amount,
-                    dose_unit=prescription.dose_unit,
-                    real_amount=prescription.real_amount,
-                    doses_per_day=prescription.doses_per_day,
-                    duration_days=prescription.duration_days,
-                    audit_result=audit_result,
-                    information=information
-                )
+                audit_result, information = audit_results_by_index.get(i, NOT_AUDITED)
                 
-                db_prescriptions.append(db_prescription)
+                prescription_rows.append({
+                    "order_id": prescription.order_id,
+                    "drug_id": prescription.drug_id,
+                    "drug_korean_name": prescription.drug_korean_name,
+                    "drug_ingredient": prescription.drug_ingredient,
+                    "dose_amount": prescription.dose_amount,
+                    "dose_unit": prescription.dose_unit,
+                    "real_amount": prescription.real_amount,
+                    "doses_per_day": prescription.doses_per_day,
+                    "duration_days": prescription.duration_days,
+                    "audit_result": audit_result,
+                    "information": information
+                })
         
         # 5. 한 번에 모든 처방 저장
-        db.add_all(db_prescriptions)
-        db.commit()
+        db_prescriptions = insert_prescription_rows(db, prescription_rows)
         
-        # 6. 각 주문별로 note 업데이트
-        for order_id in order_ids:
-            update_prescription_order_note(db, order_id)
+        # 6. 주문별 note를 한 번에 업데이트하고 한 번만 커밋
+        update_prescription_order_notes(db, order_ids)
+        db.commit()
         
         return db_prescriptions
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"배치 처방 생성 실패: {str(e)}")
 
 
 @router.get("/orders", response_model=List[PrescriptionOrderResponse])
-def get_prescription_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_prescription_orders(
+    skip: int = 0,
+    limit: int = Query(100, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="이전 페이지 마지막 주문 ID (지정 시 skip 대신 키셋 페이지네이션)"),
+    db: Session = Depends(get_db)
+):
     """
-    처방 주문 목록을 조회합니다.
+    처방 주문 목록을 ID 순으로 조회합니다.
+    다음 페이지는 마지막 항목의 id를 cursor로 전달하여 조회합니다.
     """
-    orders = db.query(PrescriptionOrder).join(Patient).offset(skip).limit(limit).all()
-    return [
-        PrescriptionOrderResponse(
-            id=order.id,
-            patient_id=order.patient_id,
-            patient_name=order.patient.name,
-            submitted_at=order.submitted_at,
-            note=order.note
+    # ORM 객체 대신 응답에 필요한 컬럼만 평탄하게 조회 (환자 이름은 같은 JOIN으로)
+    rows = (
+        db.query(
+            PrescriptionOrder.id,
+            PrescriptionOrder.patient_id,
+            Patient.name.label("patient_name"),
+            PrescriptionOrder.submitted_at,
+            PrescriptionOrder.note
         )
-        for order in orders
-    ]
+        .join(Patient)
+        .order_by(PrescriptionOrder.id)
+    )
+    if cursor is not None:
+        # OFFSET 없이 기본키 인덱스에서 바로 이어서 조회
+        rows = rows.filter(PrescriptionOrder.id > cursor)
+    else:
+        rows = rows.offset(skip)
+    rows = rows.limit(limit).all()
+    # DB에서 읽은 값이므로 응답 검증 없이 직렬화
+    return ORJSONResponse(content=[
+        PrescriptionOrderResponse.from_orm_trusted(row).model_dump() for row in rows
+    ])
 
 
 @router.get("/orders/{order_id}", response_model=PrescriptionOrderResponse)
@@ -459,30 +629,54 @@ def get_prescription_order(order_id: int, db: Session = Depends(get_db)):
     """
     특정 처방 주문을 조회합니다.
     """
-    order = db.query(PrescriptionOrder).join(Patient).filter(PrescriptionOrder.id == order_id).first()
+    order = (
+        db.query(PrescriptionOrder)
+        .join(Patient)
+        .options(contains_eager(PrescriptionOrder.patient), raiseload("*"))
+        .filter(PrescriptionOrder.id == order_id)
+        .first()
+    )
     if order is None:
         raise HTTPException(status_code=404, detail="처방 주문을 찾을 수 없습니다")
     
-    return PrescriptionOrderResponse(
+    response = PrescriptionOrderResponse.model_construct(
         id=order.id,
         patient_id=order.patient_id,
         patient_name=order.patient.name,
         submitted_at=order.submitted_at,
         note=order.note
     )
+    return ORJSONResponse(content=response.model_dump())
 
 
 @router.get("", response_model=List[PrescriptionResponse])
-def get_prescriptions(order_id: int = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_prescriptions(
+    order_id: int = None,
+    skip: int = 0,
+    limit: int = Query(100, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="이전 페이지 마지막 처방 ID (지정 시 skip 대신 키셋 페이지네이션)"),
+    db: Session = Depends(get_db)
+):
     """
-    처방 목록을 조회합니다.
+    처방 목록을 ID 순으로 조회합니다.
+    다음 페이지는 마지막 항목의 id를 cursor로 전달하여 조회합니다.
     """
-    query = db.query(Prescription)
+    query = (
+        db.query(Prescription)
+        .options(raiseload("*"))  # 응답에 관계를 쓰지 않으므로 지연 로딩 금지
+        .order_by(Prescription.id)
+    )
     if order_id:
         query = query.filter(Prescription.order_id == order_id)
     
-    prescriptions = query.offset(skip).limit(limit).all()
-    return prescriptions
+    if cursor is not None:
+        query = query.filter(Prescription.id > cursor)
+    else:
+        query = query.offset(skip)
+    prescriptions = query.limit(limit).all()
+    return ORJSONResponse(content=[
+        PrescriptionResponse.from_orm_trusted(prescription).model_dump() for prescription in prescriptions
+    ])
 
 
 @router.get("/{prescription_id}", response_model=PrescriptionResponse)
@@ -493,7 +687,7 @@ def get_prescription(prescription_id: int, db: Session = Depends(get_db)):
     prescription = db.query(Prescription).filter(Prescription.id == prescription_id).first()
     if prescription is None:
         raise HTTPException(status_code=404, detail="처방을 찾을 수 없습니다")
-    return prescription
+    return ORJSONResponse(content=PrescriptionResponse.from_orm_trusted(prescription).model_dump())
 
 
 @router.delete("/orders/{order_id}")
@@ -502,24 +696,22 @@ def delete_prescription_order(order_id: int, db: Session = Depends(get_db)):
     처방 주문과 관련된 모든 처방을 삭제합니다.
     """
     try:
-        # 관련된 모든 처방 삭제
-        prescriptions = db.query(Prescription).filter(Prescription.order_id == order_id).all()
-        for prescription in prescriptions:
-            db.delete(prescription)
-        
-        # 처방 주문 삭제
-        order = db.query(PrescriptionOrder).filter(PrescriptionOrder.id == order_id).first()
-        if order:
-            db.delete(order)
+        # 관련된 모든 처방과 처방 주문 삭제 (행을 불러오지 않고 DELETE 문으로 처리)
+        db.execute(delete(Prescription).where(Prescription.order_id == order_id))
+        result = db.execute(delete(PrescriptionOrder).where(PrescriptionOrder.id == order_id))
+        if result.rowcount == 0:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="처방 주문을 찾을 수 없습니다")
         
         db.commit()
         
         # 캐시 정리
-        if order_id in _patient_cache:
-            del _patient_cache[order_id]
+        _order_patient_cache.pop(order_id)
         
         return {"message": "처방 주문과 관련 처방이 삭제되었습니다"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"삭제 실패: {str(e)}")
@@ -537,10 +729,11 @@ def delete_prescription(prescription_id: int, db: Session = Depends(get_db)):
         
         order_id = prescription.order_id
         db.delete(prescription)
-        db.commit()
+        db.flush()
         
-        # 처방 주문 상태 업데이트
+        # 처방 주문 상태 업데이트 (삭제와 함께 커밋)
         update_prescription_order_note(db, order_id)
+        db.commit()
         
         return {"message": "처방이 삭제되었습니다"}
         
@@ -575,12 +768,7 @@ def input_prescription(request: PrescriptionInputRequest, db: Session = Depends(
             )
         
         # 2. 최신 검사수치 확인
-        latest_measurement = (
-            db.query(PatientMeasurement)
-            .filter(PatientMeasurement.patient_id == patient.id)
-            .order_by(PatientMeasurement.measured_at.desc())
-            .first()
-        )
+        latest_measurement = _latest_measurement(db, patient.id)
         
         if not latest_measurement:
             return PrescriptionInputResponse(
@@ -588,44 +776,28 @@ def input_prescription(request: PrescriptionInputRequest, db: Session = Depends(
                 message="환자의 검사수치가 없습니다. 먼저 검사수치를 입력해주세요."
             )
         
-        # 3. 처방 주문 생성
-        current_time = datetime.now()
-        db_order = PrescriptionOrder(
-            patient_id=patient.id,
-            submitted_at=current_time,
-            note=None
-        )
-        
-        db.add(db_order)
-        db.commit()
-        db.refresh(db_order)
-        
-        # 4. 처방 생성
-        db_prescriptions = []
+        # 3. 처방 생성 (환자 정보는 위에서 조회한 최신 검사수치를 그대로 사용)
+        patient_data = _to_patient_data(latest_measurement)
+        audit_service = get_audit_service()
+        prescription_rows = []
         for medication in request.medications:
             # 처방 데이터 생성
-            db_prescription = Prescription(
-                order_id=db_order.id,
-                drug_id=medication.drug_id,
-                drug_korean_name=medication.drug_korean_name,
-                drug_ingredient=medication.drug_ingredient,
-                dose_amount=medication.dose_amount,
-                dose_unit=medication.dose_unit,
-                real_amount=medication.real_amount,
-                doses_per_day=medication.doses_per_day,
-                duration_days=medication.duration_days,
-                audit_result="-",  # 기본값
-                information="적정 용량입니다."  # 기본값
-            )
-            
-            # 환자 정보 조회
-            patient_data = get_patient_data_cached(db_order.id, db)
+            prescription_row = {
+                "drug_id": medication.drug_id,
+                "drug_korean_name": medication.drug_korean_name,
+                "drug_ingredient": medication.drug_ingredient,
+                "dose_amount": medication.dose_amount,
+                "dose_unit": medication.dose_unit,
+                "real_amount": medication.real_amount,
+                "doses_per_day": medication.doses_per_day,
+                "duration_days": medication.duration_days,
+                "audit_result": "-",  # 기본값
+                "information": "적정 용량입니다."  # 기본값
+            }
             
             # 감사 실행
             if patient_data and medication.drug_id:
                 try:
-                    audit_service = get_audit_service()
-                    
                     prescription_data = {
                         "dose_amount": medication.dose_amount,
                         "real_amount": medication.real_amount,
@@ -640,30 +812,41 @@ def input_prescription(request: PrescriptionInputRequest, db: Session = Depends(
                     )
                     
                     # 감사 결과 적용
-                    db_prescription.audit_result = audit_result
-                    db_prescription.information = information
+                    prescription_row["audit_result"] = audit_result
+                    prescription_row["information"] = information
                     
                 except Exception as audit_error:
                     # 감사 실패시 기본값 유지
-                    db_prescription.audit_result = "-"
-                    db_prescription.information = f"감사 오류: {str(audit_error)}"
+                    prescription_row["audit_result"] = "-"
+                    prescription_row["information"] = f"감사 오류: {str(audit_error)}"
             
-            db_prescriptions.append(db_prescription)
+            prescription_rows.append(prescription_row)
+        
+        # 4. 처방 주문 생성: 감사 결과로 note를 미리 결정해 INSERT 한 번으로 저장 (이후 UPDATE 없음)
+        note = order_note_from_audit_results([row["audit_result"] for row in prescription_rows])
+        db_order = PrescriptionOrder(
+            patient_id=patient.id,
+            submitted_at=datetime.now(),
+            note=note
+        )
+        
+        db.add(db_order)
+        db.flush()  # 커밋 없이 주문 ID 확보
+        order_id = db_order.id
         
         # 5. 모든 처방 저장
-        db.add_all(db_prescriptions)
+        for prescription_row in prescription_rows:
+            prescription_row["order_id"] = order_id
+        db_prescriptions = insert_prescription_rows(db, prescription_rows)
         db.commit()
         
-        # 6. 처방 주문 상태 업데이트
-        update_prescription_order_note(db, db_order.id)
-        
         return PrescriptionInputResponse(
             success=True,
             patient_id=patient.id,
-            order_id=db_order.id,
+            order_id=order_id,
             prescriptions=db_prescriptions,
             message="처방이 성공적으로 입력되었습니다.",
-            note=db_order.note
+            note=note
         )
         
     except Exception as e:
@@ -689,12 +872,7 @@ def input_prescription_with_patient_id(request: PrescriptionInputWithPatientIdRe
             )
         
         # 2. 최신 검사수치 확인
-        latest_measurement = (
-            db.query(PatientMeasurement)
-            .filter(PatientMeasurement.patient_id == request.patient_id)
-            .order_by(PatientMeasurement.measured_at.desc())
-            .first()
-        )
+        latest_measurement = _latest_measurement(db, request.patient_id)
         
         if not latest_measurement:
             return PrescriptionInputResponse(
@@ -702,44 +880,28 @@ def input_prescription_with_patient_id(request: PrescriptionInputWithPatientIdRe
                 message="환자의 검사수치가 없습니다. 먼저 검사수치를 입력해주세요."
             )
         
-        # 3. 처방 주문 생성
-        current_time = datetime.now()
-        db_order = PrescriptionOrder(
-            patient_id=request.patient_id,
-            submitted_at=current_time,
-            note=None
-        )
-        
-        db.add(db_order)
-        db.commit()
-        db.refresh(db_order)
-        
-        # 4. 처방 생성
-        db_prescriptions = []
+        # 3. 처방 생성 (환자 정보는 위에서 조회한 최신 검사수치를 그대로 사용)
+        patient_data = _to_patient_data(latest_measurement)
+        audit_service = get_audit_service()
+        prescription_rows = []
         for medication in request.medications:
             # 처방 데이터 생성
-            db_prescription = Prescription(
-                order_id=db_order.id,
-                drug_id=medication.drug_id,
-                drug_korean_name=medication.drug_korean_name,
-                drug_ingredient=medication.drug_ingredient,
-                dose_amount=medication.dose_amount,
-                dose_unit=medication.dose_unit,
-                real_amount=medication.real_amount,
-                doses_per_day=medication.doses_per_day,
-                duration_days=medication.duration_days,
-                audit_result="-",  # 기본값
-                information="적정 용량입니다."  # 기본값
-            )
-            
-            # 환자 정보 조회
-            patient_data = get_patient_data_cached(db_order.id, db)
+            prescription_row = {
+                "drug_id": medication.drug_id,
+                "drug_korean_name": medication.drug_korean_name,
+                "drug_ingredient": medication.drug_ingredient,
+                "dose_amount": medication.dose_amount,
+                "dose_unit": medication.dose_unit,
+                "real_amount": medication.real_amount,
+                "doses_per_day": medication.doses_per_day,
+                "duration_days": medication.duration_days,
+                "audit_result": "-",  # 기본값
+                "information": "적정 용량입니다."  # 기본값
+            }
             
             # 감사 실행
             if patient_data and medication.drug_id:
                 try:
-                    audit_service = get_audit_service()
-                    
                     prescription_data = {
                         "dose_amount": medication.dose_amount,
                         "real_amount": medication.real_amount,
@@ -754,30 +916,41 @@ def input_prescription_with_patient_id(request: PrescriptionInputWithPatientIdRe
                     )
                     
                     # 감사 결과 적용
-                    db_prescription.audit_result = audit_result
-                    db_prescription.information = information
+                    prescription_row["audit_result"] = audit_result
+                    prescription_row["information"] = information
                     
                 except Exception as audit_error:
                     # 감사 실패시 기본값 유지
-                    db_prescription.audit_result = "-"
-                    db_prescription.information = f"감사 오류: {str(audit_error)}"
+                    prescription_row["audit_result"] = "-"
+                    prescription_row["information"] = f"감사 오류: {str(audit_error)}"
             
-            db_prescriptions.append(db_prescription)
+            prescription_rows.append(prescription_row)
+        
+        # 4. 처방 주문 생성: 감사 결과로 note를 미리 결정해 INSERT 한 번으로 저장 (이후 UPDATE 없음)
+        note = order_note_from_audit_results([row["audit_result"] for row in prescription_rows])
+        db_order = PrescriptionOrder(
+            patient_id=request.patient_id,
+            submitted_at=datetime.now(),
+            note=note
+        )
+        
+        db.add(db_order)
+        db.flush()  # 커밋 없이 주문 ID 확보
+        order_id = db_order.id
         
         # 5. 모든 처방 저장
-        db.add_all(db_prescriptions)
+        for prescription_row in prescription_rows:
+            prescription_row["order_id"] = order_id
+        db_prescriptions = insert_prescription_rows(db, prescription_rows)
         db.commit()
         
-        # 6. 처방 주문 상태 업데이트
-        update_prescription_order_note(db, db_order.id)
-        
         return PrescriptionInputResponse(
             success=True,
             patient_id=request.patient_id,
-            order_id=db_order.id,
+            order_id=order_id,
             prescriptions=db_prescriptions,
             message="처방이 성공적으로 입력되었습니다.",
-            note=db_order.note
+            note=note
         )
         
     except Exception as e:
@@ -791,6 +964,6 @@ def input_prescription_with_patient_id(request: PrescriptionInputWithPatientIdRe
 @router.post("/clear-cache")
 def clear_patient_cache():
     """환자 정보 캐시를 초기화합니다 (개발/테스트용)."""
-    global _patient_cache
+    _order_patient_cache.clear()
     _patient_cache.clear()
     return {"message": "환자 정보 캐시가 초기화되었습니다."} 
\ No newline at end of file
@@ -21,7 +21,8 @@ def main():
     print("   - 약물 검색: http://127.0.0.1:8000/api/drugs?query=검색어")
     print("   - 헬스 체크: http://127.0.0.1:8000/health")
     print("=" * 60)
-    print("🔄 자동 새로고침 모드로 실행 중...")
+    if settings.debug:
+        print("🔄 자동 새로고침 모드로 실행 중...")
     print("서버를 중지하려면 Ctrl+C를 누르세요.")
     print("=" * 60)
     
@@ -29,7 +30,7 @@ def main():
         "main:app",
         host="127.0.0.1",
         port=8000,
-        reload=True,
+        reload=settings.debug,
         log_level="info"
     )
 
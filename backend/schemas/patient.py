@@ -1,13 +1,18 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
+# 필드 패턴 (pydantic-core가 스키마 생성 시 한 번만 컴파일)
+SEX_PATTERN = r"^[MF]$"
+BIRTH_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
 
 class PatientBase(BaseModel):
     """환자 기본 스키마"""
+    model_config = ConfigDict(frozen=True)  # 생성 후 수정하지 않는 값 객체
+
     name: Optional[str] = None
-    sex: str = Field(..., pattern="^[MF]$", description="성별: M 또는 F")
-    birth_date: str = Field(..., pattern="^\d{4}-\d{2}-\d{2}$", description="생년월일 (YYYY-MM-DD)")
+    sex: str = Field(..., pattern=SEX_PATTERN, description="성별: M 또는 F")
+    birth_date: str = Field(..., pattern=BIRTH_DATE_PATTERN, description="생년월일 (YYYY-MM-DD)")
     weight_kg: float = Field(..., gt=0, description="체중 (kg)")
     height_cm: float = Field(..., gt=0, description="키 (cm)")
     scr_mg_dl: float = Field(..., ge=0, description="혈청 크레아티닌 (mg/dL)")
@@ -26,8 +31,8 @@ class PatientCreate(PatientBase):
 class PatientUpdate(BaseModel):
     """환자 수정 스키마"""
     name: Optional[str] = None
-    sex: Optional[str] = Field(None, pattern="^[MF]$", description="성별: M 또는 F")
-    birth_date: Optional[str] = Field(None, pattern="^\d{4}-\d{2}-\d{2}$", description="생년월일 (YYYY-MM-DD)")
+    sex: Optional[str] = Field(None, pattern=SEX_PATTERN, description="성별: M 또는 F")
+    birth_date: Optional[str] = Field(None, pattern=BIRTH_DATE_PATTERN, description="생년월일 (YYYY-MM-DD)")
     weight_kg: Optional[float] = Field(None, gt=0, description="체중 (kg)")
     height_cm: Optional[float] = Field(None, gt=0, description="키 (cm)")
     scr_mg_dl: Optional[float] = Field(None, ge=0, description="혈청 크레아티닌 (mg/dL)")
@@ -43,5 +48,4 @@ class PatientResponse(PatientBase):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,10 +1,12 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PrescriptionBase(BaseModel):
     """처방 기본 스키마"""
+    model_config = ConfigDict(frozen=True)  # 생성 후 수정하지 않는 값 객체
+
     order_id: int = Field(..., description="처방 주문 ID")
     drug_id: Optional[int] = Field(None, description="약물 ID")
     drug_korean_name: str = Field(..., description="약물 한글명")
@@ -44,5 +46,4 @@ class PrescriptionResponse(PrescriptionBase):
     information: str = Field(..., description="정보")
     created_at: datetime
 
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
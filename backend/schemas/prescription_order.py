@@ -1,10 +1,12 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PrescriptionOrderBase(BaseModel):
     """처방 주문 기본 스키마"""
+    model_config = ConfigDict(frozen=True)  # 생성 후 수정하지 않는 값 객체
+
     patient_id: int = Field(..., description="환자 ID")
     note: Optional[str] = Field(None, description="메모")
 
@@ -23,5 +25,4 @@ class PrescriptionOrderResponse(BaseModel):
     submitted_at: datetime = Field(..., description="제출 시간")
     note: Optional[str] = Field(None, description="메모")
 
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
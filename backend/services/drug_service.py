@@ -1,8 +1,32 @@
 import json
+import logging
 import os
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
 from fastapi import HTTPException
 
+from utils.json_loader import load_json_file
+
+logger = logging.getLogger(__name__)
+
+
+# get_drug_complete_info에서 재사용하는 (영문성분명, 단위) 캐시 크기
+COMPLETE_INFO_CACHE_SIZE = 4096
+
+
+def _fda_key(value: Any) -> Any:
+    """
+    품목일련번호/품목기준코드를 FDA 인덱스 키로 변환합니다.
+    문자열로 바꿨을 때 정수 표기와 같으면 int, 아니면 문자열을 사용하므로
+    키가 같은지 여부는 문자열 비교와 동일합니다.
+    """
+    text = str(value)
+    try:
+        number = int(text)
+    except ValueError:
+        return text
+    return number if str(number) == text else text
+
 
 class DrugService:
     """약물 정보 관련 서비스 클래스"""
@@ -10,6 +34,17 @@ class DrugService:
     def __init__(self):
         self.hira_data: List[Dict[str, Any]] = []
         self.fda_data: List[Dict[str, Any]] = []
+        self.hira_index_by_name: Dict[str, Dict[str, Any]] = {}
+        self.hira_summary_by_name: Dict[str, Dict[str, Any]] = {}
+        self.hira_code_by_name: Dict[str, Any] = {}
+        self._fda_key_by_name: Dict[str, Any] = {}
+        self.hira_unit_by_name: Dict[str, str] = {}
+        self._unique_names: List[str] = []
+        self._name_bigrams: Dict[str, Set[int]] = {}
+        # 약물명 → (영문성분명, 단위) 캐시 (데이터를 다시 로드하면 비움)
+        self._resolve_ingredient_and_unit = lru_cache(maxsize=COMPLETE_INFO_CACHE_SIZE)(
+            self._resolve_ingredient_and_unit_uncached
+        )
         self._load_hira_data()
         self._load_fda_data()
     
@@ -22,18 +57,82 @@ class DrugService:
         )
         
         try:
-            with open(hira_data_path, encoding="utf-8") as f:
-                self.hira_data = json.load(f)
-            print(f"HIRA 데이터 로드 성공: {len(self.hira_data)}개 항목")
+            self.hira_data = load_json_file(hira_data_path)
+            logger.info("HIRA 데이터 로드 성공: %d개 항목", len(self.hira_data))
         except FileNotFoundError:
-            print(f"HIRA 데이터 파일을 찾을 수 없습니다: {hira_data_path}")
+            logger.error("HIRA 데이터 파일을 찾을 수 없습니다: %s", hira_data_path)
             self.hira_data = []
         except json.JSONDecodeError as e:
-            print(f"HIRA JSON 파일 파싱 에러: {e}")
+            logger.error("HIRA JSON 파일 파싱 에러: %s", e)
             self.hira_data = []
         except Exception as e:
-            print(f"HIRA 데이터 로드 실패: {e}")
+            logger.error("HIRA 데이터 로드 실패: %s", e)
             self.hira_data = []
+        
+        self._build_hira_index()
+    
+    def _build_hira_index(self) -> None:
+        """
+        한글상품명(약품규격) → HIRA 항목 인덱스와 배치 검색용 요약 정보를 생성합니다.
+        같은 이름이 여러 번 나오면 선형 검색과 동일하게 첫 번째 항목을 사용합니다.
+        품목기준코드는 해당 키가 있는 첫 번째 항목, 단위(제형구분)는 비어있지 않은
+        첫 번째 값을 미리 찾아 둡니다.
+        """
+        self.hira_index_by_name = {}
+        self.hira_summary_by_name = {}
+        self.hira_code_by_name = {}
+        self._fda_key_by_name = {}
+        self.hira_unit_by_name = {}
+        self.cache_clear()
+        for item in self.hira_data:
+            if isinstance(item, dict) and "한글상품명(약품규격)" in item:
+                name = item["한글상품명(약품규격)"]
+                if "품목기준코드" in item and name not in self.hira_code_by_name:
+                    self.hira_code_by_name[name] = item["품목기준코드"]
+                    self._fda_key_by_name[name] = _fda_key(item["품목기준코드"])
+                if name not in self.hira_unit_by_name:
+                    unit_value = item.get("제형구분")
+                    if unit_value and str(unit_value).strip():
+                        self.hira_unit_by_name[name] = str(unit_value).strip()
+                if name in self.hira_index_by_name:
+                    continue
+                self.hira_index_by_name[name] = item
+                self.hira_summary_by_name[name] = {
+                    "제품명": name,
+                    "품목기준코드": item.get("품목기준코드"),
+                    "업체명": item.get("업체명"),
+                    "성분명": item.get("성분명"),
+                    "급여구분": item.get("급여구분"),
+                    "제형구분": item.get("제형구분"),
+                    "약품규격_숫자": item.get("약품규격_숫자")
+                }
+        
+        self._build_name_search_index()
+    
+    def _build_name_search_index(self) -> None:
+        """
+        약물명 검색용 인덱스를 생성합니다.
+        중복 없는 약물명 목록(처음 나온 순서)과 2글자 조각 → 약물명 위치 집합을 만듭니다.
+        """
+        self._unique_names = [name for name in self.hira_index_by_name if isinstance(name, str)]
+        self._name_bigrams = {}
+        for index, name in enumerate(self._unique_names):
+            for i in range(len(name) - 1):
+                self._name_bigrams.setdefault(name[i:i + 2], set()).add(index)
+    
+    def _search_candidates(self, query: str) -> Sequence[int]:
+        """검색어의 2글자 조각을 모두 포함하는 약물명 위치를 순서대로 반환합니다."""
+        if len(query) < 2:
+            return range(len(self._unique_names))
+        
+        postings = []
+        for i in range(len(query) - 1):
+            posting = self._name_bigrams.get(query[i:i + 2])
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        return sorted(postings[0].intersection(*postings[1:]))
     
     def _load_fda_data(self) -> None:
         """FDA 데이터를 로드하고 빠른 검색을 위한 인덱스를 생성합니다."""
@@ -42,34 +141,33 @@ class DrugService:
             "data", 
             "fda_data.json"
         )
+        self.cache_clear()
         
         try:
-            with open(fda_data_path, encoding="utf-8") as f:
-                self.fda_data = json.load(f)
-            print(f"FDA 데이터 로드 성공: {len(self.fda_data)}개 항목")
+            self.fda_data = load_json_file(fda_data_path)
+            logger.info("FDA 데이터 로드 성공: %d개 항목", len(self.fda_data))
             
             # 빠른 검색을 위한 인덱스 생성 (품목일련번호 → FDA 항목)
-            # HIRA 데이터의 품목기준코드는 문자열이므로, FDA 인덱스도 문자열 키로 생성
+            # 숫자 코드는 int 키, 그 외는 문자열 키 (HIRA 품목기준코드도 같은 규칙으로 미리 변환)
             self.fda_index = {}
             for item in self.fda_data:
                 if isinstance(item, dict) and "품목일련번호" in item:
                     item_serial = item["품목일련번호"]
                     if item_serial:
-                        # 문자열로 변환하여 키로 사용
-                        self.fda_index[str(item_serial)] = item
+                        self.fda_index[_fda_key(item_serial)] = item
             
-            print(f"FDA 인덱스 생성 완료: {len(self.fda_index)}개 항목")
+            logger.info("FDA 인덱스 생성 완료: %d개 항목", len(self.fda_index))
             
         except FileNotFoundError:
-            print(f"FDA 데이터 파일을 찾을 수 없습니다: {fda_data_path}")
+            logger.error("FDA 데이터 파일을 찾을 수 없습니다: %s", fda_data_path)
             self.fda_data = []
             self.fda_index = {}
         except json.JSONDecodeError as e:
-            print(f"FDA JSON 파일 파싱 에러: {e}")
+            logger.error("FDA JSON 파일 파싱 에러: %s", e)
             self.fda_data = []
             self.fda_index = {}
         except Exception as e:
-            print(f"FDA 데이터 로드 실패: {e}")
+            logger.error("FDA 데이터 로드 실패: %s", e)
             self.fda_data = []
             self.fda_index = {}
     
@@ -97,23 +195,22 @@ class DrugService:
             return []
         
         try:
-            result = []
+            unique_result = []
             query = query.strip()
             
-            for item in self.hira_data:
-                if isinstance(item, dict) and "한글상품명(약품규격)" in item:
-                    drug_name_with_spec = item["한글상품명(약품규격)"]
-                    if query in drug_name_with_spec:
-                        result.append(drug_name_with_spec)
-            
-            # 중복 제거 및 제한된 개수만 반환
-            unique_result = list(dict.fromkeys(result))[:limit]
-            print(f"약물 검색 쿼리 '{query}': {len(unique_result)}개 결과")
+            # 2글자 조각 인덱스로 후보를 좁힌 뒤 실제 포함 여부만 확인 (중복 없는 약물명 목록 기준)
+            for index in self._search_candidates(query):
+                drug_name_with_spec = self._unique_names[index]
+                if query in drug_name_with_spec:
+                    unique_result.append(drug_name_with_spec)
+                    if len(unique_result) >= limit:
+                        break
+            logger.debug("약물 검색 쿼리 '%s': %d개 결과", query, len(unique_result))
             
             return unique_result
             
         except Exception as e:
-            print(f"약물 검색 에러: {e}")
+            logger.error("약물 검색 에러: %s", e)
             raise HTTPException(
                 status_code=500, 
                 detail=f"약물 검색 중 서버 에러가 발생했습니다: {str(e)}"
@@ -129,15 +226,19 @@ class DrugService:
         Returns:
             약물 정보 딕셔너리 또는 None
         """
-        if not self.hira_data:
-            return None
-        
-        for item in self.hira_data:
-            if isinstance(item, dict) and "한글상품명(약품규격)" in item:
-                if item["한글상품명(약품규격)"] == drug_name:
-                    return item
+        return self.hira_index_by_name.get(drug_name)
+    
+    def get_drug_summary_by_name(self, drug_name: str) -> Optional[Dict[str, Any]]:
+        """
+        약물명으로 배치 검색용 요약 정보(제품명, 품목기준코드, 업체명 등)를 가져옵니다.
         
-        return None
+        Args:
+            drug_name: 약물명 (한글상품명(약품규격) 형태)
+            
+        Returns:
+            미리 생성된 요약 딕셔너리 또는 None
+        """
+        return self.hira_summary_by_name.get(drug_name)
     
     def get_english_ingredient_by_korean_name(self, korean_drug_name: str) -> str:
         """
@@ -150,36 +251,27 @@ class DrugService:
             영문성분명 또는 "-" (찾을 수 없는 경우)
         """
         try:
-            # 1. HIRA 데이터에서 품목기준코드 찾기
-            item_standard_code = None
-            for hira_item in self.hira_data:
-                if (isinstance(hira_item, dict) and 
-                    "한글상품명(약품규격)" in hira_item and 
-                    "품목기준코드" in hira_item):
-                    
-                    if hira_item["한글상품명(약품규격)"] == korean_drug_name:
-                        item_standard_code = hira_item["품목기준코드"]
-                        break
+            # 1. HIRA 인덱스에서 품목기준코드 찾기
+            item_standard_code = self.hira_code_by_name.get(korean_drug_name)
             
             if not item_standard_code:
-                print(f"품목기준코드를 찾을 수 없습니다: {korean_drug_name}")
+                logger.debug("품목기준코드를 찾을 수 없습니다: %s", korean_drug_name)
                 return "-"
             
             # 2. FDA 데이터에서 품목일련번호로 영문성분명 찾기
-            # 품목기준코드와 품목일련번호가 같은 값이라고 가정
-            # 문자열로 변환하여 검색 (FDA 인덱스가 문자열 키로 구성됨)
-            fda_item = self.fda_index.get(str(item_standard_code))
+            # 품목기준코드와 품목일련번호가 같은 값이라고 가정 (로드 시 변환해 둔 인덱스 키 사용)
+            fda_item = self.fda_index.get(self._fda_key_by_name[korean_drug_name])
             
             if fda_item and "영문성분명" in fda_item:
                 english_ingredient = fda_item["영문성분명"]
-                print(f"영문성분명 찾음: {korean_drug_name} → {english_ingredient}")
+                logger.debug("영문성분명 찾음: %s → %s", korean_drug_name, english_ingredient)
                 return english_ingredient
             else:
-                print(f"영문성분명을 찾을 수 없습니다: {korean_drug_name} (코드: {item_standard_code})")
+                logger.debug("영문성분명을 찾을 수 없습니다: %s (코드: %s)", korean_drug_name, item_standard_code)
                 return "-"
                 
         except Exception as e:
-            print(f"영문성분명 검색 중 에러: {e}")
+            logger.warning("영문성분명 검색 중 에러: %s", e)
             return "-"
     
     def get_unit_by_korean_name(self, korean_drug_name: str) -> str:
@@ -196,26 +288,17 @@ class DrugService:
             return "-"
         
         try:
-            # 동일한 한글상품명을 가진 모든 항목을 찾아서
-            # 첫 번째로 비어있지 않은 제형구분 값을 반환
-            for item in self.hira_data:
-                if (isinstance(item, dict) and 
-                    "한글상품명(약품규격)" in item and 
-                    item["한글상품명(약품규격)"] == korean_drug_name):
-                    
-                    # 제형구분 필드 확인
-                    if "제형구분" in item:
-                        unit_value = item["제형구분"]
-                        # 값이 있고 비어있지 않은 경우 반환
-                        if unit_value and str(unit_value).strip():
-                            print(f"단위 찾음: {korean_drug_name} → {unit_value}")
-                            return str(unit_value).strip()
+            # 동일한 한글상품명을 가진 항목 중 첫 번째로 비어있지 않은 제형구분 값 (로드 시 생성)
+            unit_value = self.hira_unit_by_name.get(korean_drug_name)
+            if unit_value:
+                logger.debug("단위 찾음: %s → %s", korean_drug_name, unit_value)
+                return unit_value
             
-            print(f"단위를 찾을 수 없습니다: {korean_drug_name}")
+            logger.debug("단위를 찾을 수 없습니다: %s", korean_drug_name)
             return "-"
             
         except Exception as e:
-            print(f"단위 검색 중 에러: {e}")
+            logger.warning("단위 검색 중 에러: %s", e)
             return "-"
 
     def get_drug_details_with_unit(self, korean_drug_name: str) -> Optional[Dict[str, Any]]:
@@ -256,9 +339,8 @@ class DrugService:
         if not hira_info:
             return None
         
-        # 영문성분명과 단위 추가
-        english_ingredient = self.get_english_ingredient_by_korean_name(korean_drug_name)
-        unit = self.get_unit_by_korean_name(korean_drug_name)
+        # 영문성분명과 단위 추가 (같은 약물의 반복 조회는 캐시 사용)
+        english_ingredient, unit = self._resolve_ingredient_and_unit(korean_drug_name)
         
         result = hira_info.copy()
         result["영문성분명"] = english_ingredient
@@ -266,6 +348,17 @@ class DrugService:
         
         return result
 
+    def _resolve_ingredient_and_unit_uncached(self, korean_drug_name: str) -> Tuple[str, str]:
+        """약물명으로 (영문성분명, 단위)를 찾습니다."""
+        return (
+            self.get_english_ingredient_by_korean_name(korean_drug_name),
+            self.get_unit_by_korean_name(korean_drug_name),
+        )
+
+    def cache_clear(self) -> None:
+        """약물명 기반 조회 캐시를 비웁니다. 데이터를 다시 로드할 때 호출합니다."""
+        self._resolve_ingredient_and_unit.cache_clear()
+
     def get_total_drug_count(self) -> int:
         """전체 약물 데이터 개수를 반환합니다."""
         return len(self.hira_data)
@@ -275,5 +368,12 @@ class DrugService:
         return len(self.fda_data)
 
 
-# 싱글톤 인스턴스
-drug_service = DrugService() 
\ No newline at end of file
+# 싱글톤 인스턴스 (import 시점이 아니라 처음 사용할 때 또는 서버 시작 시 생성)
+_drug_service_instance = None
+
+def get_drug_service() -> DrugService:
+    """약물 서비스의 싱글톤 인스턴스를 반환합니다."""
+    global _drug_service_instance
+    if _drug_service_instance is None:
+        _drug_service_instance = DrugService()
+    return _drug_service_instance 
\ No newline at end of file
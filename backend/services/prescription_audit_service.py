@@ -1,17 +1,105 @@
 import json
+import logging
 import os
 import math
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import HTTPException
 
+from utils.json_loader import load_json_file
+
+logger = logging.getLogger(__name__)
+
+# 감사 결과 캐시 최대 항목 수
+AUDIT_CACHE_SIZE = 10000
+
+# 기준 용량 단위 분류 (로드 시 dose_unit 문자열을 미리 분류)
+DOSE_UNIT_FIXED = 0        # "마이크로그램", "밀리그램", "정", "밀리리터" 등 - 기준 용량 그대로 사용
+DOSE_UNIT_PER_BSA = 1      # 체표면적당 용량
+DOSE_UNIT_PER_WEIGHT = 2   # 체중당 용량
+_DOSE_UNIT_CODES = {
+    "밀리그램/제곱미터": DOSE_UNIT_PER_BSA,
+    "밀리그램/킬로그램": DOSE_UNIT_PER_WEIGHT,
+    "밀리그램/킬로그램/일": DOSE_UNIT_PER_WEIGHT,
+    "밀리리터/킬로그램": DOSE_UNIT_PER_WEIGHT,
+}
+
+
+# 감사하지 않은 처방의 결과 (감사 결과, 복약지도문구) - 불변 튜플이므로 공유해도 안전
+NOT_AUDITED = ("-", "")
+
+# 복약지도문구가 없는 행 표시 (None 값과 구분)
+_NO_GUIDANCE = object()
+
+
+def _is_missing(value: Any) -> bool:
+    """None 또는 NaN(pandas로 내보낸 빈 값)인지 확인합니다."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+@dataclass(slots=True)
+class DosageRule:
+    """
+    dosagedata.json 한 행을 감사에 필요한 값만 담아 로드 시 한 번 정규화한 용량 기준.
+    변환할 수 없는 값은 None으로 두어 감사 시 기존과 같이 오류 처리됩니다.
+    """
+    drug_id: Any
+    dose_amount: Any                 # 원본 기준 용량 (0이면 금기)
+    dose_value: Optional[float]      # float로 변환한 기준 용량
+    dose_unit: Optional[str]         # 공백을 제거한 단위
+    dose_unit_code: int              # DOSE_UNIT_* 분류
+    crcl_min: Any                    # None/NaN을 -9999로 치환한 신기능 하한
+    crcl_max: Any                    # None/NaN을 9999로 치환한 신기능 상한
+    rf_indicator: Any
+    dialysis_required: bool
+    doses_per_interval: Any
+    interval_length_days: Any
+    divided_dosing: Any
+    guidance: Any                    # 복약지도문구 (없으면 _NO_GUIDANCE)
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "DosageRule":
+        """JSON 행을 용량 기준으로 변환합니다."""
+        crcl_min = row.get("crcl_min")
+        crcl_max = row.get("crcl_max")
+        dose_amount = row.get("dose_amount", 0)
+        try:
+            dose_value = float(dose_amount)
+        except (TypeError, ValueError):
+            dose_value = None
+        dose_unit = row.get("dose_unit", "")
+        dose_unit = dose_unit.strip() if isinstance(dose_unit, str) else None
+        return cls(
+            drug_id=row.get("drug_id"),
+            dose_amount=dose_amount,
+            dose_value=dose_value,
+            dose_unit=dose_unit,
+            dose_unit_code=_DOSE_UNIT_CODES.get(dose_unit, DOSE_UNIT_FIXED),
+            crcl_min=-9999 if _is_missing(crcl_min) else crcl_min,
+            crcl_max=9999 if _is_missing(crcl_max) else crcl_max,
+            rf_indicator=row.get("rf_indicator", "crcl"),
+            dialysis_required=row.get("dialysis_required") is True,
+            doses_per_interval=row.get("doses_per_interval", 1),
+            interval_length_days=row.get("interval_length_days", 1),
+            divided_dosing=row.get("divided_dosing", False),
+            guidance=row.get("복약지도문구", _NO_GUIDANCE),
+        )
+
+    def guidance_or(self, default: str) -> Any:
+        """복약지도문구를 반환합니다. 없으면 default를 반환합니다."""
+        return default if self.guidance is _NO_GUIDANCE else self.guidance
+
 
 class PrescriptionAuditService:
     """처방 감사 서비스 클래스 - 성능 최적화 버전"""
     
     def __init__(self):
-        self.dosage_data: List[Dict[str, Any]] = []
-        self.dosage_index: Dict[int, List[Dict[str, Any]]] = {}  # drug_id별 인덱스
+        self.dosage_data: List[DosageRule] = []
+        self.dosage_index: Dict[int, List[DosageRule]] = {}  # drug_id별 인덱스
         self._load_and_index_dosage_data()
+        # 동일 환자 수치 + 약물 + 용량 조합의 감사 결과 캐시 (재방문 환자, 반복 처방)
+        self._audit_cached = lru_cache(maxsize=AUDIT_CACHE_SIZE)(self._audit_from_key)
     
     def _load_and_index_dosage_data(self) -> None:
         """dosagedata.json을 로드하고 drug_id별로 인덱싱합니다."""
@@ -22,33 +110,34 @@ class PrescriptionAuditService:
         )
         
         try:
-            with open(dosage_data_path, encoding="utf-8") as f:
-                self.dosage_data = json.load(f)
+            # JSON 행(딕셔너리)을 슬롯 기반 용량 기준으로 변환 (정규화는 여기서 한 번만)
+            # dosagedata.json에는 NaN 리터럴이 있으므로 표준 json으로 바로 파싱
+            self.dosage_data = [DosageRule.from_row(row) for row in load_json_file(dosage_data_path, allow_nan=True)]
             
             # drug_id별 인덱스 생성 (성능 최적화)
-            for row in self.dosage_data:
-                drug_id = row.get("drug_id")
+            for rule in self.dosage_data:
+                drug_id = rule.drug_id
                 if drug_id:
                     if drug_id not in self.dosage_index:
                         self.dosage_index[drug_id] = []
-                    self.dosage_index[drug_id].append(row)
+                    self.dosage_index[drug_id].append(rule)
             
-            print(f"✅ 용량 데이터 인덱싱 완료: {len(self.dosage_data)}개 항목, {len(self.dosage_index)}개 drug_id")
+            logger.info("용량 데이터 인덱싱 완료: %d개 항목, %d개 drug_id", len(self.dosage_data), len(self.dosage_index))
             
         except FileNotFoundError:
-            print(f"❌ 용량 데이터 파일을 찾을 수 없습니다: {dosage_data_path}")
+            logger.error("용량 데이터 파일을 찾을 수 없습니다: %s", dosage_data_path)
             self.dosage_data = []
             self.dosage_index = {}
         except json.JSONDecodeError as e:
-            print(f"❌ 용량 데이터 JSON 파일 파싱 에러: {e}")
+            logger.error("용량 데이터 JSON 파일 파싱 에러: %s", e)
             self.dosage_data = []
             self.dosage_index = {}
         except Exception as e:
-            print(f"❌ 용량 데이터 로드 실패: {e}")
+            logger.error("용량 데이터 로드 실패: %s", e)
             self.dosage_data = []
             self.dosage_index = {}
     
-    def get_dosage_rows_by_drug_id(self, drug_id: int) -> List[Dict[str, Any]]:
+    def get_dosage_rows_by_drug_id(self, drug_id: int) -> List[DosageRule]:
         """drug_id로 해당하는 모든 dosage 행을 O(1) 시간에 반환합니다."""
         return self.dosage_index.get(drug_id, [])
     
@@ -62,24 +151,51 @@ class PrescriptionAuditService:
         }
         return float(mapping.get(rf_indicator, 0))
     
+    def _patient_rf_value_cached(
+        self,
+        patient: Dict[str, Any],
+        rf_indicator: str,
+        rf_values: Optional[Dict[str, float]]
+    ) -> float:
+        """배치 단위 캐시(rf_values)를 사용해 환자의 신기능 기준값을 반환합니다."""
+        if rf_values is None:
+            return self._get_patient_rf_value(patient, rf_indicator)
+        value = rf_values.get(rf_indicator)
+        if value is None:
+            value = rf_values[rf_indicator] = self._get_patient_rf_value(patient, rf_indicator)
+        return value
+    
     def _select_best_dosage_row(
         self, 
-        dosage_rows: List[Dict[str, Any]], 
+        dosage_rows: List[DosageRule], 
         patient: Dict[str, Any],
-        prescription: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """환자 조건에 가장 적합한 dosage row를 선택합니다 (대폭 최적화)."""
+        prescription: Dict[str, Any],
+        rf_values: Optional[Dict[str, float]] = None
+    ) -> Optional[DosageRule]:
+        """
+        환자 조건에 가장 적합한 dosage row를 선택합니다 (대폭 최적화).
+        rf_values를 넘기면 같은 환자의 신기능 기준값을 지표별로 한 번만 계산합니다.
+        """
         
         if not dosage_rows:
             return None
         
         is_hd = patient.get("is_hd", False)
+        
+        # 기준 행이 하나뿐이면 용량 비교 없이 투석/신기능 조건만 확인
+        if len(dosage_rows) == 1:
+            row = dosage_rows[0]
+            if row.dialysis_required:
+                return row if is_hd else None
+            patient_rf_value = self._patient_rf_value_cached(patient, row.rf_indicator, rf_values)
+            return row if row.crcl_min <= patient_rf_value <= row.crcl_max else None
+        
         patient_amount = float(prescription.get("real_amount") or prescription.get("dose_amount", 0) or 0)
         
         # 투석 환자인 경우 투석 필수 행 우선 검색 (빠른 종료)
         if is_hd:
             for row in dosage_rows:
-                if row.get("dialysis_required") is True:
+                if row.dialysis_required:
                     return row
         
         # 환자 신기능 값 한 번만 계산
@@ -92,29 +208,20 @@ class PrescriptionAuditService:
         
         for row in dosage_rows:
             # 투석 조건 빠른 체크
-            if row.get("dialysis_required") is True and not is_hd:
+            if row.dialysis_required and not is_hd:
                 continue
             
             # 신기능 범위 체크 (지연 계산)
             if rf_indicator is None:
-                rf_indicator = row.get("rf_indicator", "crcl")
-                patient_rf_value = self._get_patient_rf_value(patient, rf_indicator)
-            
-            # NaN 처리 최적화 (한 번에 처리)
-            crcl_min = row.get("crcl_min")
-            crcl_max = row.get("crcl_max")
-            
-            if crcl_min is None or (isinstance(crcl_min, float) and math.isnan(crcl_min)):
-                crcl_min = -9999
-            if crcl_max is None or (isinstance(crcl_max, float) and math.isnan(crcl_max)):
-                crcl_max = 9999
+                rf_indicator = row.rf_indicator
+                patient_rf_value = self._patient_rf_value_cached(patient, rf_indicator, rf_values)
             
-            # 신기능 범위 체크
-            if not (crcl_min <= patient_rf_value <= crcl_max):
+            # 신기능 범위 체크 (None/NaN은 로드 시 정규화됨)
+            if not (row.crcl_min <= patient_rf_value <= row.crcl_max):
                 continue
             
             # 용량 체크와 최적 선택을 한 번에 (분리된 루프 제거)
-            dose_amount = float(row.get("dose_amount", 0))
+            dose_amount = row.dose_value
             if dose_amount >= patient_amount:
                 dose_diff = dose_amount - patient_amount
                 if dose_diff < best_dose_diff:
@@ -127,37 +234,24 @@ class PrescriptionAuditService:
     
     def _calculate_reference_dose(
         self, 
-        dosage_row: Dict[str, Any], 
+        dosage_row: DosageRule, 
         patient: Dict[str, Any]
     ) -> float:
         """단위에 따라 기준 용량을 계산합니다."""
-        
-        dose_amount = float(dosage_row.get("dose_amount", 0))
-        dose_unit = dosage_row.get("dose_unit", "").strip()
-        
         # 캐시된 환자 정보 사용
-        weight_kg = patient.get("weight_kg", 70)
-        bsa = patient.get("bsa", 1.73)
-        
-        if dose_unit == "밀리그램/제곱미터":
-            return dose_amount * bsa
-        elif dose_unit in ("밀리그램/킬로그램", "밀리그램/킬로그램/일", "밀리리터/킬로그램"):
-            return dose_amount * weight_kg
-        else:  # "마이크로그램", "밀리그램", "정", "밀리리터"
-            return dose_amount
+        return self._calculate_reference_dose_optimized(
+            dosage_row, patient.get("weight_kg", 70), patient.get("bsa", 1.73)
+        )
     
-    def _calculate_reference_frequency(self, dosage_row: Dict[str, Any]) -> float:
+    def _calculate_reference_frequency(self, dosage_row: DosageRule) -> float:
         """기준 투여 빈도를 계산합니다 (일당 횟수)."""
-        doses_per_interval = dosage_row.get("doses_per_interval", 1)
-        interval_length_days = dosage_row.get("interval_length_days", 1)
-        
-        return doses_per_interval / interval_length_days
+        return dosage_row.doses_per_interval / dosage_row.interval_length_days
     
     def audit_prescriptions_batch(
         self,
         patient: Dict[str, Any],
         prescriptions_data: List[Dict[str, Any]]
-    ) -> List[Dict[str, str]]:
+    ) -> List[Tuple[str, str]]:
         """
         여러 처방을 배치로 감사합니다 (대폭 최적화).
         
@@ -166,16 +260,20 @@ class PrescriptionAuditService:
             prescriptions_data: 처방 데이터 리스트 (drug_id, dose_amount, real_amount, doses_per_day 포함)
             
         Returns:
-            audit_results: 각 처방의 감사 결과와 복약지도문구를 포함한 딕셔너리 리스트
+            audit_results: 각 처방의 (감사 결과, 복약지도문구) 튜플 리스트
         """
         # 환자 공통 정보 미리 계산 (한 번만)
         patient_weight = patient.get("weight_kg", 70)
         patient_bsa = patient.get("bsa", 1.73)
         is_hd = patient.get("is_hd", False)
+        # 신기능 지표별 환자 기준값 (배치 안에서 지표마다 한 번만 계산)
+        rf_values: Dict[str, float] = {}
+        # (약물, 용량) 조합별 감사 결과 (배치 안에서만 사용)
+        outcomes: Dict[tuple, tuple] = {}
         
-        # 리스트 크기 미리 할당하여 append 오버헤드 제거
+        # 리스트 크기 미리 할당하여 append 오버헤드 제거 (각 칸은 아래에서 한 번만 채움)
         prescription_count = len(prescriptions_data)
-        results = [{"audit_result": "-", "information": ""}] * prescription_count
+        results: List[Tuple[str, str]] = [NOT_AUDITED] * prescription_count
         
         # 인덱스 기반 루프로 최적화 (enumerate 오버헤드 제거)
         for i in range(prescription_count):
@@ -183,11 +281,20 @@ class PrescriptionAuditService:
             drug_id = prescription_data.get("drug_id")
             
             if drug_id:
-                # 개별 감사 실행 (공통 환자 정보 재사용)
-                audit_result, information = self._audit_single_prescription_with_info(
-                    patient, prescription_data, drug_id, patient_weight, patient_bsa, is_hd
+                # 같은 배치(같은 환자) 안에서 동일한 약물/용량 조합은 한 번만 감사
+                key = (
+                    drug_id,
+                    prescription_data.get("dose_amount", 0),
+                    prescription_data.get("real_amount"),
+                    prescription_data.get("doses_per_day", 1),
                 )
-                results[i] = {"audit_result": audit_result, "information": information}
+                outcome = outcomes.get(key)
+                if outcome is None:
+                    # 개별 감사 실행 (공통 환자 정보 재사용)
+                    outcome = outcomes[key] = self._audit_single_prescription_with_info(
+                        patient, prescription_data, drug_id, patient_weight, patient_bsa, is_hd, rf_values
+                    )
+                results[i] = outcome
         
         return results
     
@@ -198,7 +305,8 @@ class PrescriptionAuditService:
         drug_id: int,
         patient_weight: float = None,
         patient_bsa: float = None,
-        is_hd: bool = None
+        is_hd: bool = None,
+        rf_values: Optional[Dict[str, float]] = None
     ) -> tuple[str, str]:
         """
         단일 처방 감사 (내부 메서드, 대폭 최적화).
@@ -211,17 +319,19 @@ class PrescriptionAuditService:
                 return "-", ""  # 기준 데이터가 없으면 감사 불가
             
             # 2. 최적의 dosage row 선택
-            selected_row = self._select_best_dosage_row(dosage_rows, patient, prescription)
+            selected_row = self._select_best_dosage_row(dosage_rows, patient, prescription, rf_values)
             if not selected_row:
                 return "-", ""  # 적합한 기준을 찾을 수 없음
             
             # 3. 기준 용량 금기 체크 (빠른 종료)
-            reference_dose_amount = selected_row.get("dose_amount", 0)
+            reference_dose_amount = selected_row.dose_amount
             if reference_dose_amount == 0:
-                return "금기", selected_row.get("복약지도문구", "해당 약물은 이 환자에게 금기입니다.")
+                return "금기", selected_row.guidance_or("해당 약물은 이 환자에게 금기입니다.")
             
-            # 4. 환자 투여량과 빈도 정보 (한 번만 계산)
-            dose_unit = selected_row.get("dose_unit", "").strip()
+            # 4. 환자 투여량과 빈도 정보 (한 번만 계산, 단위는 로드 시 정규화됨)
+            dose_unit = selected_row.dose_unit
+            if dose_unit is None:
+                raise ValueError("용량 기준의 단위(dose_unit)가 올바르지 않습니다")
             
             # 단위에 따라 다른 필드 사용
             if dose_unit == "정":
@@ -234,41 +344,42 @@ class PrescriptionAuditService:
             patient_doses_per_day = int(prescription.get("doses_per_day", 1))
             
             # 5. 기준값 계산 (인라인 최적화)
-            if dose_unit == "밀리그램/제곱미터":
-                reference_dose = float(reference_dose_amount) * patient_bsa
-            elif dose_unit in ("밀리그램/킬로그램", "밀리그램/킬로그램/일", "밀리리터/킬로그램"):
-                reference_dose = float(reference_dose_amount) * patient_weight
+            dose_unit_code = selected_row.dose_unit_code
+            if dose_unit_code == DOSE_UNIT_PER_BSA:
+                reference_dose = selected_row.dose_value * patient_bsa
+            elif dose_unit_code == DOSE_UNIT_PER_WEIGHT:
+                reference_dose = selected_row.dose_value * patient_weight
             else:  # "마이크로그램", "밀리그램", "정", "밀리리터"
-                reference_dose = float(reference_dose_amount)
+                reference_dose = selected_row.dose_value
             
             # 6. 기준 빈도 계산 (인라인 최적화)
-            doses_per_interval = selected_row.get("doses_per_interval", 1)
-            interval_length_days = selected_row.get("interval_length_days", 1)
+            doses_per_interval = selected_row.doses_per_interval
+            interval_length_days = selected_row.interval_length_days
             reference_frequency = float(doses_per_interval) / float(interval_length_days)
             
             # 7. divided_dosing 여부에 따른 감사 (최적화)
-            divided_dosing = selected_row.get("divided_dosing", False)
+            divided_dosing = selected_row.divided_dosing
             
             if divided_dosing:
                 # divided_dosing = True: 일일 총 용량으로 비교
                 patient_total = patient_amount * patient_doses_per_day
                 reference_total = reference_dose * reference_frequency
                 if patient_total > reference_total:
-                    return "용량조절필요", selected_row.get("복약지도문구", "용량조절이 필요합니다.")
+                    return "용량조절필요", selected_row.guidance_or("용량조절이 필요합니다.")
             else:
                 # divided_dosing = False: 회당 용량으로 비교
                 if patient_amount > reference_dose:
-                    return "용량조절필요", selected_row.get("복약지도문구", "용량조절이 필요합니다.")
+                    return "용량조절필요", selected_row.guidance_or("용량조절이 필요합니다.")
             
             # 8. 투여 간격 체크 (간단한 로직)
             if patient_doses_per_day > reference_frequency * 1.5:
-                return "투여간격조절필요", selected_row.get("복약지도문구", "투여 간격 조절이 필요합니다.")
+                return "투여간격조절필요", selected_row.guidance_or("투여 간격 조절이 필요합니다.")
             
             # 정상인 경우
-            return "-", selected_row.get("복약지도문구", "적정 용량입니다.")
+            return "-", selected_row.guidance_or("적정 용량입니다.")
             
         except Exception as e:
-            print(f"❌ 단일 처방 감사 오류: {e}")
+            logger.warning("단일 처방 감사 오류: %s", e)
             return "-", "감사 중 오류가 발생했습니다."
 
     def _audit_single_prescription(
@@ -295,12 +406,14 @@ class PrescriptionAuditService:
                 return "-"  # 적합한 기준을 찾을 수 없음
             
             # 3. 기준 용량 금기 체크 (빠른 종료)
-            reference_dose_amount = selected_row.get("dose_amount", 0)
+            reference_dose_amount = selected_row.dose_amount
             if reference_dose_amount == 0:
                 return "금기"
             
-            # 4. 환자 투여량과 빈도 정보 (한 번만 계산)
-            dose_unit = selected_row.get("dose_unit", "").strip()
+            # 4. 환자 투여량과 빈도 정보 (한 번만 계산, 단위는 로드 시 정규화됨)
+            dose_unit = selected_row.dose_unit
+            if dose_unit is None:
+                raise ValueError("용량 기준의 단위(dose_unit)가 올바르지 않습니다")
             
             # 단위에 따라 다른 필드 사용
             if dose_unit == "정":
@@ -313,20 +426,21 @@ class PrescriptionAuditService:
             patient_doses_per_day = int(prescription.get("doses_per_day", 1))
             
             # 5. 기준값 계산 (인라인 최적화)
-            if dose_unit == "밀리그램/제곱미터":
-                reference_dose = float(reference_dose_amount) * patient_bsa
-            elif dose_unit in ("밀리그램/킬로그램", "밀리그램/킬로그램/일", "밀리리터/킬로그램"):
-                reference_dose = float(reference_dose_amount) * patient_weight
+            dose_unit_code = selected_row.dose_unit_code
+            if dose_unit_code == DOSE_UNIT_PER_BSA:
+                reference_dose = selected_row.dose_value * patient_bsa
+            elif dose_unit_code == DOSE_UNIT_PER_WEIGHT:
+                reference_dose = selected_row.dose_value * patient_weight
             else:  # "마이크로그램", "밀리그램", "정", "밀리리터"
-                reference_dose = float(reference_dose_amount)
+                reference_dose = selected_row.dose_value
             
             # 6. 기준 빈도 계산 (인라인 최적화)
-            doses_per_interval = selected_row.get("doses_per_interval", 1)
-            interval_length_days = selected_row.get("interval_length_days", 1)
+            doses_per_interval = selected_row.doses_per_interval
+            interval_length_days = selected_row.interval_length_days
             reference_frequency = float(doses_per_interval) / float(interval_length_days)
             
             # 7. divided_dosing 여부에 따른 감사 (최적화)
-            divided_dosing = selected_row.get("divided_dosing", False)
+            divided_dosing = selected_row.divided_dosing
             
             if divided_dosing:
                 # divided_dosing = True: 일일 총 용량으로 비교
@@ -349,21 +463,17 @@ class PrescriptionAuditService:
     
     def _calculate_reference_dose_optimized(
         self,
-        dosage_row: Dict[str, Any],
+        dosage_row: DosageRule,
         patient_weight: float,
         patient_bsa: float
     ) -> float:
         """단위에 따라 기준 용량을 계산합니다 (최적화 버전)."""
-        
-        dose_amount = float(dosage_row.get("dose_amount", 0))
-        dose_unit = dosage_row.get("dose_unit", "").strip()
-        
-        if dose_unit == "밀리그램/제곱미터":
-            return dose_amount * patient_bsa
-        elif dose_unit in ("밀리그램/킬로그램", "밀리그램/킬로그램/일", "밀리리터/킬로그램"):
-            return dose_amount * patient_weight
+        if dosage_row.dose_unit_code == DOSE_UNIT_PER_BSA:
+            return dosage_row.dose_value * patient_bsa
+        elif dosage_row.dose_unit_code == DOSE_UNIT_PER_WEIGHT:
+            return dosage_row.dose_value * patient_weight
         else:  # "마이크로그램", "밀리그램", "정", "밀리리터"
-            return dose_amount
+            return dosage_row.dose_value
 
     def audit_prescription(
         self, 
@@ -382,13 +492,44 @@ class PrescriptionAuditService:
         Returns:
             audit_result: "금기", "용량조절필요", "투여간격조절필요", "-" 중 하나
         """
-        # 최적화된 내부 메서드 호출
-        patient_weight = patient.get("weight_kg", 70)
-        patient_bsa = patient.get("bsa", 1.73)
-        is_hd = patient.get("is_hd", False)
+        # 감사에 쓰이는 값만으로 캐시 키 구성 (값을 반올림하지 않으므로 결과는 항상 동일)
+        key = (
+            drug_id,
+            patient.get("weight_kg", 70),
+            patient.get("bsa", 1.73),
+            patient.get("crcl", 0),
+            patient.get("crcl_normalization", 0),
+            patient.get("egfr", 0),
+            patient.get("scr_mg_dl", 0),
+            patient.get("is_hd", False),
+            prescription.get("dose_amount", 0),
+            prescription.get("real_amount"),
+            prescription.get("doses_per_day", 1),
+        )
+        return self._audit_cached(key)
+    
+    def _audit_from_key(self, key: tuple) -> str:
+        """캐시 키로부터 환자/처방 정보를 복원해 감사를 수행합니다."""
+        (drug_id, weight_kg, bsa, crcl, crcl_normalization, egfr, scr_mg_dl, is_hd,
+         dose_amount, real_amount, doses_per_day) = key
+        patient = {
+            "weight_kg": weight_kg,
+            "bsa": bsa,
+            "crcl": crcl,
+            "crcl_normalization": crcl_normalization,
+            "egfr": egfr,
+            "scr_mg_dl": scr_mg_dl,
+            "is_hd": is_hd
+        }
+        prescription = {
+            "dose_amount": dose_amount,
+            "real_amount": real_amount,
+            "doses_per_day": doses_per_day
+        }
         
+        # 최적화된 내부 메서드 호출
         return self._audit_single_prescription(
-            patient, prescription, drug_id, patient_weight, patient_bsa, is_hd
+            patient, prescription, drug_id, weight_kg, bsa, is_hd
         )
 
 
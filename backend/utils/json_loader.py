@@ -0,0 +1,18 @@
+import json
+
+import orjson
+
+
+def load_json_file(path: str, allow_nan: bool = False):
+    """
+    JSON 파일을 파싱합니다.
+
+    기본적으로 orjson으로 파싱합니다. orjson은 NaN/Infinity 리터럴을 허용하지 않으므로,
+    NaN이 포함된 것으로 알려진 파일(pandas로 내보낸 데이터)은 allow_nan=True로
+    표준 json 모듈을 바로 사용합니다 (orjson 파싱 실패 후 재파싱하지 않음).
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if allow_nan:
+        return json.loads(raw)
+    return orjson.loads(raw)
@@ -1,84 +1,142 @@
-import re
-from typing import Tuple, Optional
+import logging
+from typing import NamedTuple, Tuple, Optional
 from fastapi import HTTPException
+from sqlalchemy import bindparam, exists, select
+from sqlalchemy.exc import SQLAlchemyError
 
+from models.patient import Patient
 
-def validate_and_parse_resident_number(resident_number: str) -> Tuple[str, str]:
+logger = logging.getLogger(__name__)
+
+# 하이픈 제거 후 주민등록번호 길이 (6자리 생년월일 + 7자리)
+RESIDENT_NUMBER_LENGTH = 13
+
+# 입력에서 제거할 문자(공백, 하이픈) 삭제 테이블
+_STRIP_TABLE = str.maketrans('', '', ' -')
+
+# 뒷자리 첫 번째 숫자(0~9)별 출생 세기와 성별 ('0', '9'는 사용하지 않는 값)
+_CENTURY = ('', '19', '19', '20', '20', '19', '19', '20', '20', '')
+_SEX = ('', 'M', 'F', 'M', 'F', 'M', 'F', 'M', 'F', '')
+
+
+class ParsedResidentNumber(NamedTuple):
+    """주민등록번호 파싱 결과 (튜플이므로 birth_date, sex = ... 형태의 언패킹도 가능)"""
+    birth_date: str  # YYYY-MM-DD
+    sex: str  # 'M' 또는 'F'
+
+
+# 생년월일/성별로 환자 1명 조회 (같은 조건이면 먼저 등록된 환자, 컴파일된 SQL 재사용)
+_FIND_PATIENT_STMT = (
+    select(Patient)
+    .where(Patient.birth_date == bindparam("birth_date"), Patient.sex == bindparam("sex"))
+    .order_by(Patient.id)
+    .limit(1)
+)
+
+# 동일 이름/생년월일/성별 환자 존재 여부 (행을 읽지 않고 EXISTS만 확인)
+_PATIENT_EXISTS_STMT = select(
+    exists().where(
+        Patient.birth_date == bindparam("birth_date"),
+        Patient.sex == bindparam("sex"),
+        Patient.name == bindparam("name")
+    )
+)
+
+# 검증 실패 시 응답 메시지
+_FORMAT_ERROR = "올바른 주민등록번호 형식이 아닙니다. (예: 900101-1234567)"
+_MONTH_ERROR = "올바르지 않은 월입니다."
+_DAY_ERROR = "올바르지 않은 일입니다."
+_FIRST_DIGIT_ERROR = "올바르지 않은 주민등록번호입니다. (첫 번째 자리 오류)"
+
+
+def _parse_resident_number(resident_number: str) -> Tuple[Optional[ParsedResidentNumber], Optional[str]]:
     """
-    주민등록번호를 검증하고 생년월일과 성별을 추출합니다.
+    주민등록번호를 예외 없이 파싱합니다.
     
-    Args:
-        resident_number: 주민등록번호 (예: "900101-1234567" 또는 "9001011234567")
-        
     Returns:
-        Tuple[str, str]: (생년월일, 성별) - 생년월일은 "YYYY-MM-DD" 형식, 성별은 "M" 또는 "F"
-        
-    Raises:
-        HTTPException: 주민등록번호 형식이 올바르지 않은 경우
+        (ParsedResidentNumber, None) 또는 검증 실패 시 (None, 오류 메시지)
     """
-    # 공백 제거 및 하이픈 제거
-    cleaned_number = resident_number.replace(' ', '').replace('-', '')
-    
-    # 주민등록번호 형식 검증 (6자리-7자리)
-    pattern = r'^(\d{6})(\d{7})$'
-    match = re.match(pattern, cleaned_number)
+    # 공백 제거 및 하이픈 제거 (이미 13자리 숫자만으로 된 입력은 그대로 사용)
+    if len(resident_number) == RESIDENT_NUMBER_LENGTH and resident_number.isdigit():
+        cleaned_number = resident_number
+    else:
+        cleaned_number = resident_number.translate(_STRIP_TABLE)
     
-    if not match:
-        raise HTTPException(
-            status_code=400, 
-            detail="올바른 주민등록번호 형식이 아닙니다. (예: 900101-1234567)"
-        )
+    # 주민등록번호 형식 검증 (6자리-7자리, ASCII 숫자만) - 고정 길이이므로 정규식 없이 확인
+    if (
+        len(cleaned_number) != RESIDENT_NUMBER_LENGTH
+        or not cleaned_number.isascii()
+        or not cleaned_number.isdigit()
+    ):
+        return None, _FORMAT_ERROR
     
-    birth_part = match.group(1)
-    identifier_part = match.group(2)
+    birth_part = cleaned_number[:6]
+    identifier_part = cleaned_number[6:]
     
     # 생년월일 추출
     year = birth_part[:2]
     month = birth_part[2:4]
     day = birth_part[4:6]
     
-    # 월과 일 유효성 검사
-    try:
-        month_int = int(month)
-        day_int = int(day)
-        
-        if not (1 <= month_int <= 12):
-            raise HTTPException(
-                status_code=400, 
-                detail="올바르지 않은 월입니다."
-            )
-        
-        if not (1 <= day_int <= 31):
-            raise HTTPException(
-                status_code=400, 
-                detail="올바르지 않은 일입니다."
-            )
-            
-    except ValueError:
-        raise HTTPException(
-            status_code=400, 
-            detail="주민등록번호의 월 또는 일이 숫자가 아닙니다."
-        )
+    # 월과 일 유효성 검사 (숫자임은 위에서 확인했으므로 앞 6자리를 한 번만 정수로 변환)
+    month_int, day_int = divmod(int(birth_part) % 10000, 100)
+    
+    if not (1 <= month_int <= 12):
+        return None, _MONTH_ERROR
+    
+    if not (1 <= day_int <= 31):
+        return None, _DAY_ERROR
     
     # 1900년대 또는 2000년대 판단
     first_digit = int(identifier_part[0])
+    century = _CENTURY[first_digit]
     
-    if first_digit in [1, 2, 5, 6]:
-        full_year = f"19{year}"
-    elif first_digit in [3, 4, 7, 8]:
-        full_year = f"20{year}"
-    else:
-        raise HTTPException(
-            status_code=400, 
-            detail="올바르지 않은 주민등록번호입니다. (첫 번째 자리 오류)"
-        )
+    if not century:
+        return None, _FIRST_DIGIT_ERROR
     
-    birth_date = f"{full_year}-{month}-{day}"
+    birth_date = f"{century}{year}-{month}-{day}"
     
     # 성별 추출
-    sex = 'M' if first_digit in [1, 3, 5, 7] else 'F'
+    sex = _SEX[first_digit]
     
-    return birth_date, sex
+    return ParsedResidentNumber(birth_date, sex), None
+
+
+def parse_resident_number(resident_number: str) -> Optional[ParsedResidentNumber]:
+    """
+    주민등록번호에서 생년월일과 성별을 추출합니다. 예외를 발생시키지 않습니다.
+    
+    Args:
+        resident_number: 주민등록번호 (예: "900101-1234567" 또는 "9001011234567")
+        
+    Returns:
+        Optional[ParsedResidentNumber]: (생년월일, 성별), 올바르지 않은 번호이면 None
+    """
+    return _parse_resident_number(resident_number)[0]
+
+
+def validate_and_parse_resident_number(resident_number: str) -> ParsedResidentNumber:
+    """
+    주민등록번호를 검증하고 생년월일과 성별을 추출합니다.
+    
+    Args:
+        resident_number: 주민등록번호 (예: "900101-1234567" 또는 "9001011234567")
+        
+    Returns:
+        ParsedResidentNumber: (생년월일, 성별) - 생년월일은 "YYYY-MM-DD" 형식, 성별은 "M" 또는 "F"
+        
+    Raises:
+        HTTPException: 주민등록번호 형식이 올바르지 않은 경우
+    """
+    parsed, error = _parse_resident_number(resident_number)
+    
+    if parsed is None:
+        raise HTTPException(
+            status_code=400, 
+            detail=error
+        )
+    
+    return parsed
 
 
 def find_patient_by_resident_number(db_session, resident_number: str):
@@ -92,25 +150,25 @@ def find_patient_by_resident_number(db_session, resident_number: str):
     Returns:
         Patient: 찾은 환자 객체 또는 None
     """
-    try:
-        from models.patient import Patient
-        
-        birth_date, sex = validate_and_parse_resident_number(resident_number)
-        
-        patient = db_session.query(Patient).filter(
-            Patient.birth_date == birth_date,
-            Patient.sex == sex
-        ).first()
-        
-        return patient
-        
-    except HTTPException:
+    # 형식이 올바르지 않으면 예외 없이 바로 None 반환
+    parsed = parse_resident_number(resident_number)
+    if parsed is None:
         return None
-    except Exception:
+    
+    birth_date, sex = parsed
+    
+    try:
+        # 같은 생년월일/성별 환자가 여럿이면 먼저 등록된 환자를 반환
+        # (복합 인덱스 순서(name)에 따라 결과가 바뀌지 않도록 id 순으로 고정)
+        return db_session.execute(
+            _FIND_PATIENT_STMT, {"birth_date": birth_date, "sex": sex}
+        ).scalar_one_or_none()
+    except SQLAlchemyError:
+        logger.exception("주민등록번호로 환자 조회 실패")
         return None
 
 
-def create_patient_from_resident_number(db_session, name: str, resident_number: str):
+def create_patient_from_resident_number(db_session, name: str, resident_number: str, flush_only: bool = False):
     """
     주민등록번호로부터 환자 정보를 생성합니다.
     
@@ -118,6 +176,7 @@ def create_patient_from_resident_number(db_session, name: str, resident_number:
         db_session: 데이터베이스 세션
         name: 환자 이름
         resident_number: 주민등록번호
+        flush_only: True이면 커밋하지 않고 flush만 수행 (호출자가 트랜잭션을 커밋)
         
     Returns:
         Patient: 생성된 환자 객체
@@ -125,18 +184,14 @@ def create_patient_from_resident_number(db_session, name: str, resident_number:
     Raises:
         HTTPException: 주민등록번호가 올바르지 않거나 환자가 이미 존재하는 경우
     """
-    from models.patient import Patient
-    
     birth_date, sex = validate_and_parse_resident_number(resident_number)
     
-    # 중복 환자 체크 (이름, 생년월일, 성별 모두 확인)
-    existing_patient = db_session.query(Patient).filter(
-        Patient.name == name,
-        Patient.birth_date == birth_date,
-        Patient.sex == sex
-    ).first()
+    # 중복 환자 체크 (이름, 생년월일, 성별 모두 확인) - 객체를 만들지 않고 EXISTS로만 확인
+    patient_exists = db_session.execute(
+        _PATIENT_EXISTS_STMT, {"birth_date": birth_date, "sex": sex, "name": name}
+    ).scalar()
     
-    if existing_patient:
+    if patient_exists:
         raise HTTPException(
             status_code=400, 
             detail="이미 존재하는 환자입니다. (동일한 이름, 생년월일, 성별)"
@@ -150,6 +205,10 @@ def create_patient_from_resident_number(db_session, name: str, resident_number:
     )
     
     db_session.add(patient)
+    if flush_only:
+        db_session.flush()
+        return patient
+    
     db_session.commit()
     db_session.refresh(patient)
     
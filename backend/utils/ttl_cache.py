@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from threading import RLock
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    최대 크기와 만료 시간(TTL)이 있는 스레드 안전 LRU 캐시.
+
+    크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    ttl초가 지난 항목은 조회 시점에 만료 처리합니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시된 값을 반환합니다. 없거나 만료되었으면 default를 반환합니다."""
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return default
+            if expires_at <= monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값을 저장하고, 최대 크기를 넘으면 가장 오래된 항목을 제거합니다."""
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        """항목을 제거하고 그 값을 반환합니다."""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def clear(self) -> None:
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,5 +1,7 @@
+import orjson
 import requests
-import json
+
+BASE_URL = "http://localhost:8000"
 
 # 테스트 데이터
 test_data = {
@@ -36,38 +38,40 @@ test_data = {
     ]
 }
 
-# 감사 실행 요청 보내기
+# 감사 실행 요청 보내기 (두 요청이 같은 keep-alive 연결을 재사용하도록 Session 사용)
 try:
-    response = requests.post(
-        "http://localhost:8000/api/audit/execute",
-        json=test_data,
-        headers={"Content-Type": "application/json"}
-    )
+    with requests.Session() as session:
+        response = session.post(
+            f"{BASE_URL}/api/audit/execute",
+            data=orjson.dumps(test_data),
+            headers={"Content-Type": "application/json"}
+        )
     
-    print(f"응답 상태 코드: {response.status_code}")
-    print(f"응답 내용: {response.text}")
+        # 응답 본문은 한 번만 디코딩해 출력과 결과 확인에 함께 사용
+        result = orjson.loads(response.content)
+        print(f"응답 상태 코드: {response.status_code}")
+        print(f"응답 내용: {result}")
     
-    if response.status_code == 200:
-        result = response.json()
-        order_id = result.get("order_id")
-        print(f"✅ 감사 완료! Order ID: {order_id}")
+        if response.status_code == 200:
+            order_id = result.get("order_id")
+            print(f"✅ 감사 완료! Order ID: {order_id}")
         
-        # 결과 확인을 위해 감사 기록 조회
-        history_response = requests.get("http://localhost:8000/api/audit/history")
-        if history_response.status_code == 200:
-            history = history_response.json()
-            print("\n📋 감사 기록:")
-            for record in history["history"][:1]:  # 최신 1개만 확인
-                print(f"  주문 ID: {record['order_id']}")
-                print(f"  환자 ID: {record['patient_id']}")
-                print(f"  환자 이름: {record['patient_name']}")
-                print(f"  처방 개수: {record['prescription_count']}")
-                print(f"  처방 목록:")
-                for prescription in record["prescriptions"]:
-                    print(f"    - {prescription['drug_name']}: {prescription['audit_result']}")
+            # 결과 확인을 위해 감사 기록 조회
+            history_response = session.get(f"{BASE_URL}/api/audit/history")
+            if history_response.status_code == 200:
+                history = orjson.loads(history_response.content)
+                print("\n📋 감사 기록:")
+                for record in history["history"][:1]:  # 최신 1개만 확인
+                    print(f"  주문 ID: {record['order_id']}")
+                    print(f"  환자 ID: {record['patient_id']}")
+                    print(f"  환자 이름: {record['patient_name']}")
+                    print(f"  처방 개수: {record['prescription_count']}")
+                    print(f"  처방 목록:")
+                    for prescription in record["prescriptions"]:
+                        print(f"    - {prescription['drug_name']}: {prescription['audit_result']}")
                     
-    else:
-        print(f"❌ 감사 실패: {response.status_code}")
+        else:
+            print(f"❌ 감사 실패: {response.status_code}")
         
 except Exception as e:
     print(f"❌ 테스트 실행 중 오류: {e}") 
\ No newline at end of file